@@ -4,27 +4,61 @@ FirstLine Schools
 """
 
 import os
+import re
 import json
+import time
+import queue
+import atexit
 import uuid
+import secrets
 import logging
 import smtplib
+import threading
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from functools import wraps
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Flask, request, jsonify, send_file, session, redirect, url_for
+from flask import Flask, request, jsonify, send_file, session, redirect, url_for, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
+from requests.adapters import HTTPAdapter
+from google.auth import default as google_auth_default
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
+import orjson
 from authlib.integrations.flask_client import OAuth
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=self.option),
+                                        mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get('SECRET_KEY') or os.environ.get('FLASK_SECRET_KEY') or os.urandom(32)
+if isinstance(app.secret_key, bytes):
+    # Sessions (and the admin access cached in them) won't carry across Cloud Run instances
+    logger.warning("SECRET_KEY not set - sessions are only valid on this instance")
 # Trust proxy headers (required for Cloud Run to detect https)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 CORS(app)
@@ -39,10 +73,17 @@ TABLE_ID = 'applications'
 # Email Configuration
 SMTP_EMAIL = os.environ.get('SMTP_EMAIL', 'talent@firstlineschools.org')
 SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')
+EMAIL_ENABLED = bool(SMTP_PASSWORD)
+if not EMAIL_ENABLED:
+    logger.warning("SMTP_PASSWORD not configured, notification emails are disabled")
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_PORT = 587
 TALENT_TEAM_EMAIL = 'talent@firstlineschools.org'
 SABBATICAL_ADMIN_EMAIL = 'sshirey@firstlineschools.org'  # Additional admin for sabbatical notifications
+
+# Links in notification emails
+PORTAL_URL = os.environ.get('PORTAL_URL', 'https://sabbatical-program-965913991496.us-central1.run.app')
+MY_SABBATICAL_URL = f"{PORTAL_URL}/my-sabbatical"
 HR_EMAIL = 'hr@firstlineschools.org'
 BENEFITS_EMAIL = 'benefits@firstlineschools.org'
 PAYROLL_EMAIL = 'payroll@firstlineschools.org'
@@ -76,6 +117,13 @@ SABBATICAL_SCHOOL_LEADER_TITLES = [
     'head of school',
 ]
 
+# Lookup forms of the lists above (built once at startup). Keyword lists become a single
+# case-insensitive contains-match pattern so each title is scanned once per access level.
+SABBATICAL_ADMIN_EXCEPTIONS_LOWER = frozenset(e.lower() for e in SABBATICAL_ADMIN_EXCEPTIONS)
+SABBATICAL_NETWORK_ADMIN_TITLES_SET = frozenset(SABBATICAL_NETWORK_ADMIN_TITLES)
+SABBATICAL_C_TEAM_PATTERN = re.compile('|'.join(map(re.escape, SABBATICAL_C_TEAM_KEYWORDS)), re.IGNORECASE)
+SABBATICAL_SCHOOL_LEADER_PATTERN = re.compile('|'.join(map(re.escape, SABBATICAL_SCHOOL_LEADER_TITLES)), re.IGNORECASE)
+
 # Email aliases - map alternative emails to primary FirstLine emails
 # Format: 'alternate@email.com': 'primary@firstlineschools.org'
 EMAIL_ALIASES = {
@@ -93,6 +141,14 @@ def resolve_email_alias(email):
     return EMAIL_ALIASES.get(email.lower(), email)
 
 
+# How long a computed admin access level is trusted before BigQuery is asked again
+ADMIN_ACCESS_CACHE_TTL = int(os.environ.get('ADMIN_ACCESS_CACHE_TTL', 600))
+
+# In-process cache shared across sessions: email -> (checked_at, access dict)
+_admin_access_cache = {}
+_admin_access_cache_lock = threading.Lock()
+
+
 def get_sabbatical_admin_access(email):
     """
     Determine the user's admin access level for the sabbatical program.
@@ -101,50 +157,81 @@ def get_sabbatical_admin_access(email):
     - {'level': 'network'} - Can see all applications across the network
     - {'level': 'school', 'school': 'Location Name'} - Can see their school's applications
     - {'level': 'none'} - No admin access
+
+    Returns None if the lookup failed, so callers can retry instead of storing it.
+    Results are cached per email for ADMIN_ACCESS_CACHE_TTL seconds.
     """
     if not email:
         return {'level': 'none'}
 
     email_lower = email.lower()
 
+    with _admin_access_cache_lock:
+        cached = _admin_access_cache.get(email_lower)
+    if cached and time.time() - cached[0] < ADMIN_ACCESS_CACHE_TTL:
+        return dict(cached[1])
+
+    try:
+        access = lookup_sabbatical_admin_access(email_lower)
+    except Exception as e:
+        # Don't cache failures - a transient BigQuery error shouldn't lock out an admin
+        logger.error(f"Error checking sabbatical admin access: {e}")
+        return None
+
+    with _admin_access_cache_lock:
+        _admin_access_cache[email_lower] = (time.time(), access)
+    return dict(access)
+
+
+def clear_admin_access_cache(email=None):
+    """Drop cached admin access for one email, or for everyone if no email is given."""
+    with _admin_access_cache_lock:
+        if email:
+            _admin_access_cache.pop(email.lower(), None)
+        else:
+            _admin_access_cache.clear()
+
+
+def get_session_admin_access(user):
+    """
+    Get the admin access stored on the signed-in user's session.
+    Re-checks (and re-stores) it once the session copy is older than ADMIN_ACCESS_CACHE_TTL.
+    If the re-check fails, nothing is stored so the next request tries again.
+    """
+    access = user.get('admin_access')
+    checked_at = user.get('admin_access_checked_at', 0)
+    if not access or time.time() - checked_at >= ADMIN_ACCESS_CACHE_TTL:
+        fresh = get_sabbatical_admin_access(user.get('email', ''))
+        if fresh is None:
+            return access or {'level': 'none'}
+        access = fresh
+        user['admin_access'] = access
+        user['admin_access_checked_at'] = time.time()
+        user['is_admin'] = access['level'] != 'none'
+        session.modified = True
+    return access
+
+
+def lookup_sabbatical_admin_access(email_lower):
+    """Look up admin access for a lowercased email (uncached; raises on BigQuery errors)."""
     # 1. Check team inbox exceptions (shared accounts without BigQuery profiles)
-    if email_lower in [e.lower() for e in SABBATICAL_ADMIN_EXCEPTIONS]:
+    if email_lower in SABBATICAL_ADMIN_EXCEPTIONS_LOWER:
         return {'level': 'network'}
 
     # 2. Check job title for network admin or school leader access
-    try:
-        query = f"""
-        SELECT Job_Title, Location_Name
-        FROM `{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function`
-        WHERE LOWER(Email_Address) = @email
-        AND Employment_Status IN ('Active', 'Leave of absence')
-        LIMIT 1
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("email", "STRING", email_lower)]
-        )
-        results = list(bq_client.query(query, job_config=job_config).result())
+    member = get_staff_member(email_lower, active_only=True)
 
-        if results:
-            job_title = results[0].Job_Title or ''
-            location = results[0].Location_Name or ''
+    if member:
+        job_title = member['Job_Title'] or ''
+        location = member['Location_Name'] or ''
 
-            # Check if title matches C-Team keywords (contains-match)
-            title_lower = job_title.lower()
-            for keyword in SABBATICAL_C_TEAM_KEYWORDS:
-                if keyword.lower() in title_lower:
-                    return {'level': 'network'}
+        # C-Team keywords (contains-match) or the explicit network admin list
+        if SABBATICAL_C_TEAM_PATTERN.search(job_title) or job_title in SABBATICAL_NETWORK_ADMIN_TITLES_SET:
+            return {'level': 'network'}
 
-            # Check if title is in the explicit network admin list
-            if job_title in SABBATICAL_NETWORK_ADMIN_TITLES:
-                return {'level': 'network'}
-
-            # Check if job title matches school leader patterns
-            for leader_title in SABBATICAL_SCHOOL_LEADER_TITLES:
-                if leader_title in job_title.lower():
-                    return {'level': 'school', 'school': location}
-    except Exception as e:
-        logger.error(f"Error checking sabbatical admin access: {e}")
+        # Check if job title matches school leader patterns
+        if SABBATICAL_SCHOOL_LEADER_PATTERN.search(job_title):
+            return {'level': 'school', 'school': location}
 
     return {'level': 'none'}
 
@@ -160,15 +247,63 @@ STATUS_VALUES = [
     'Withdrawn'
 ]
 
+# Statuses where the employee has a sabbatical to plan on the My Sabbatical page
+MY_SABBATICAL_STATUSES = frozenset([
+    'Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning',
+    'Confirmed', 'On Sabbatical', 'Returning', 'Completed'
+])
+
+# Statuses that hold dates on the calendar and count toward site conflicts
+SCHEDULED_STATUSES = frozenset(['Approved', 'Tentatively Approved', 'Plan Submitted', 'Submitted'])
+
+# Years of service required to be eligible for a sabbatical
+SABBATICAL_MIN_YEARS = 10
+
+# Test override for system testing - always treated as eligible
+TEST_ELIGIBLE_EMAILS = ['sshirey@firstlineschools.org']
+
 # Sabbatical options with pay percentages
 SABBATICAL_OPTIONS = {
     '8 Weeks - 100% Salary': {'weeks': 8, 'salary_pct': 100},
     '10 Weeks - 80% Salary': {'weeks': 10, 'salary_pct': 80},
     '12 Weeks - 67% Salary': {'weeks': 12, 'salary_pct': 67}
 }
+SABBATICAL_OPTION_NAMES = list(SABBATICAL_OPTIONS)
+
+# Options and statuses only change with a deploy, so browsers may reuse them briefly
+STATIC_LIST_MAX_AGE = 300
 
 # BigQuery client
-bq_client = bigquery.Client(project=PROJECT_ID)
+# Size of the HTTP connection pool shared by all request threads (urllib3 defaults to 10)
+BQ_POOL_SIZE = int(os.environ.get('BQ_POOL_SIZE', 50))
+# Per-query billing cap, applied to every query the app runs
+BQ_MAX_BYTES_BILLED = int(os.environ.get('BQ_MAX_BYTES_BILLED', 10**9))
+
+
+def create_bigquery_client():
+    """
+    Create the BigQuery client with a connection pool large enough for concurrent requests.
+    Every query gets result caching, interactive priority and a billing cap by default.
+    """
+    credentials, _ = google_auth_default(scopes=bigquery.Client.SCOPE)
+    http = AuthorizedSession(credentials)
+    http.mount('https://', HTTPAdapter(pool_connections=BQ_POOL_SIZE, pool_maxsize=BQ_POOL_SIZE))
+    default_job_config = bigquery.QueryJobConfig(
+        use_query_cache=True,
+        priority=bigquery.QueryPriority.INTERACTIVE,
+        maximum_bytes_billed=BQ_MAX_BYTES_BILLED
+    )
+    return bigquery.Client(project=PROJECT_ID, credentials=credentials, _http=http,
+                           default_query_job_config=default_job_config)
+
+
+bq_client = create_bigquery_client()
+# Shared Storage Read API client for bulk reads, so each read reuses one gRPC channel
+bqstorage_client = bigquery_storage.BigQueryReadClient()
+
+# Worker threads for running independent BigQuery lookups in parallel
+BQ_QUERY_WORKERS = int(os.environ.get('BQ_QUERY_WORKERS', 16))
+query_executor = ThreadPoolExecutor(max_workers=BQ_QUERY_WORKERS)
 
 # OAuth setup
 oauth = OAuth(app)
@@ -184,29 +319,214 @@ else:
     google = None
 
 
+# ============ Staff Roster ============
+
+STAFF_TABLE = f"{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function"
+ACTIVE_EMPLOYMENT_STATUSES = ('Active', 'Leave of absence')
+
+# The staff list changes at most daily, so keep it in memory and reload it every 15 minutes
+STAFF_ROSTER_TTL = int(os.environ.get('STAFF_ROSTER_TTL', 900))
+# After a failed reload, keep serving the old roster and retry after this many seconds
+STAFF_ROSTER_RETRY = 60
+
+_staff_roster = {'loaded_at': 0, 'data': None}
+_staff_roster_lock = threading.Lock()
+
+# Supervisor chains stop after this many levels (guards against cycles in the staff data)
+SUPERVISOR_CHAIN_MAX_LEVELS = 10
+
+STAFF_ROSTER_QUERY = f"""
+SELECT
+    First_Name,
+    Last_Name,
+    Preferred_First_Name,
+    Email_Address,
+    Job_Title,
+    Location_Name,
+    Last_Hire_Date,
+    Employment_Status,
+    Supervisor_Name__Unsecured_,
+    Employee_Name__Last_Suffix__First_MI_
+FROM `{STAFF_TABLE}`
+WHERE Employment_Status IS NULL OR Employment_Status != 'Terminated'
+"""
+
+
+def calculate_years_of_service(hire_date, current_year):
+    """
+    Years of service from a hire date (DATE or TIMESTAMP column) as of current_year.
+    Counts calendar years like BigQuery's DATE_DIFF(..., YEAR).
+    """
+    if not hire_date:
+        return None
+    if isinstance(hire_date, datetime):
+        hire_date = hire_date.date()
+    return current_year - hire_date.year
+
+
+def load_staff_roster():
+    """
+    Read all non-terminated staff from BigQuery.
+    Returns {'by_email': {email: member}, 'by_name_key': {name_key: [active members]}}.
+    """
+    # Bulk read over the BigQuery Storage API (Arrow) instead of paging JSON over REST
+    rows = bq_client.query(STAFF_ROSTER_QUERY).result().to_arrow(bqstorage_client=bqstorage_client).to_pylist()
+
+    by_email = {}
+    by_name_key = {}
+    current_year = datetime.now(timezone.utc).year
+    for member in rows:
+        member['years_of_service'] = calculate_years_of_service(member['Last_Hire_Date'], current_year)
+
+        # Supervisors are matched by "Last, First MI" name, active staff only
+        if member['Employment_Status'] in ACTIVE_EMPLOYMENT_STATUSES and member['Employee_Name__Last_Suffix__First_MI_']:
+            by_name_key.setdefault(member['Employee_Name__Last_Suffix__First_MI_'], []).append(member)
+
+        if not member['Email_Address']:
+            continue
+        email = member['Email_Address'].lower()
+        existing = by_email.get(email)
+        # If someone has more than one record, prefer the active one
+        if existing is None or (existing['Employment_Status'] not in ACTIVE_EMPLOYMENT_STATUSES
+                                and member['Employment_Status'] in ACTIVE_EMPLOYMENT_STATUSES):
+            by_email[email] = member
+    logger.info(f"Loaded staff roster: {len(by_email)} staff")
+    return {'by_email': by_email, 'by_name_key': by_name_key}
+
+
+def get_staff_roster():
+    """
+    Get the cached staff roster, reloading it from BigQuery when stale.
+    Raises if the roster has never loaded successfully.
+    """
+    if time.time() - _staff_roster['loaded_at'] < STAFF_ROSTER_TTL:
+        return _staff_roster['data']
+
+    with _staff_roster_lock:
+        # Another thread may have reloaded while we waited for the lock
+        if time.time() - _staff_roster['loaded_at'] < STAFF_ROSTER_TTL:
+            return _staff_roster['data']
+        try:
+            _staff_roster['data'] = load_staff_roster()
+            _staff_roster['loaded_at'] = time.time()
+        except Exception as e:
+            if _staff_roster['data'] is None:
+                raise
+            logger.error(f"Error reloading staff roster, using previous copy: {e}")
+            _staff_roster['loaded_at'] = time.time() - STAFF_ROSTER_TTL + STAFF_ROSTER_RETRY
+        return _staff_roster['data']
+
+
+def expire_staff_roster():
+    """Mark the cached staff roster stale so the next lookup reloads it."""
+    with _staff_roster_lock:
+        _staff_roster['loaded_at'] = 0
+
+
+def get_staff_member(email, active_only=False):
+    """
+    Look up a staff member by email in the cached roster.
+    With active_only, only Active / Leave of absence staff are returned.
+    """
+    if not email:
+        return None
+    member = get_staff_roster()['by_email'].get(email.lower())
+    if member and active_only and member['Employment_Status'] not in ACTIVE_EMPLOYMENT_STATUSES:
+        return None
+    return member
+
+
 # ============ Email Functions ============
 
+# Notification emails are handed to these threads so requests don't wait on SMTP
+email_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='email')
+
+
+def _log_email_task_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"Notification email task failed: {exc}", exc_info=exc)
+
+
+def queue_email(fn, *args, **kwargs):
+    """Run an email task on email_executor, logging it if it raises."""
+    future = email_executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_email_task_failure)
+    return future
+
+# Logged-in SMTP sessions kept for reuse, so each email skips the TLS handshake and login
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', 4))
+# Sessions idle longer than this are closed rather than reused (Gmail drops idle sessions)
+SMTP_IDLE_TIMEOUT = int(os.environ.get('SMTP_IDLE_TIMEOUT', 60))
+_smtp_pool = queue.LifoQueue(maxsize=SMTP_POOL_SIZE)
+
+
+def _connect_smtp():
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30)
+    server.starttls()
+    server.login(SMTP_EMAIL, SMTP_PASSWORD)
+    return server
+
+
+def _close_smtp(server):
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+def _get_smtp():
+    """Take a live pooled SMTP session, or open a new one if none are idle."""
+    while True:
+        try:
+            server, released_at = _smtp_pool.get_nowait()
+        except queue.Empty:
+            return _connect_smtp()
+
+        if time.monotonic() - released_at > SMTP_IDLE_TIMEOUT:
+            _close_smtp(server)
+            continue
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            # Dead session (reset socket, timeout, ...) - drop it and try the next one
+            pass
+        _close_smtp(server)
+
+
+def _release_smtp(server):
+    """Return an SMTP session to the pool, closing it if the pool is full."""
+    try:
+        _smtp_pool.put_nowait((server, time.monotonic()))
+    except queue.Full:
+        _close_smtp(server)
+
+
 def send_email(to_email, subject, html_body, cc_emails=None):
     """Send an email using Gmail SMTP."""
-    if not SMTP_PASSWORD:
-        logger.warning("SMTP_PASSWORD not configured, skipping email")
+    if not EMAIL_ENABLED:
         return False
 
     try:
-        msg = MIMEMultipart('alternative')
+        # HTML only, so a single MIMEText part (no multipart/alternative wrapper)
+        msg = MIMEText(html_body, 'html')
         msg['Subject'] = subject
         msg['From'] = f"FirstLine Schools Talent <{SMTP_EMAIL}>"
         msg['To'] = to_email
         if cc_emails:
             msg['Cc'] = ', '.join(cc_emails)
 
-        msg.attach(MIMEText(html_body, 'html'))
-
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_EMAIL, SMTP_PASSWORD)
-            recipients = [to_email] + (cc_emails or [])
+        recipients = [to_email] + (cc_emails or [])
+        # _get_smtp() has already checked the session with NOOP; once sendmail starts Gmail may
+        # have accepted the message, so a failure here is not retried (it could send a duplicate)
+        server = _get_smtp()
+        try:
             server.sendmail(SMTP_EMAIL, recipients, msg.as_string())
+        except Exception:
+            _close_smtp(server)
+            raise
+        _release_smtp(server)
 
         logger.info(f"Email sent to {to_email}: {subject}")
         return True
@@ -215,8 +535,61 @@ def send_email(to_email, subject, html_body, cc_emails=None):
         return False
 
 
+# Static parts of the notification emails, built once at import
+EMAIL_FOOTER_HTML = """
+            <p style="color: #666; font-size: 0.9em; margin-top: 30px;">Questions? Contact talent@firstlineschools.org</p>
+        </div>
+        <div style="background-color: #002f60; padding: 15px; text-align: center;">
+            <p style="color: white; margin: 0; font-size: 0.9em;">FirstLine Schools - Education For Life</p>
+        </div>
+    </div>
+    """
+
+# Status update email text and highlight color per new status
+STATUS_UPDATE_MESSAGES = {
+    'Tentatively Approved': "Great news! Your sabbatical application has been TENTATIVELY APPROVED! Please complete your planning checklist to receive final approval.",
+    'Approved': "Congratulations! Your sabbatical application has received FINAL APPROVAL! Your sabbatical dates are now confirmed.",
+    'Denied': "After careful consideration, we are unable to approve your sabbatical request at this time.",
+    'Withdrawn': "Your sabbatical application has been withdrawn as requested."
+}
+STATUS_UPDATE_COLORS = {
+    'Approved': '#22c55e',  # Green
+    'Tentatively Approved': '#6B46C1',  # Purple
+    'Denied': '#ef4444',  # Red
+    'Withdrawn': '#ef4444',  # Red
+}
+
+# Planning page call-to-action added to status update emails
+STATUS_PLANNING_LINKS = {
+    'Tentatively Approved': f"""
+            <div style="background-color: #6B46C1; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
+                <p style="color: white; margin: 0 0 15px 0; font-size: 1.1em;">Start planning your sabbatical now!</p>
+                <a href="{MY_SABBATICAL_URL}"
+                   style="display: inline-block; background-color: #D4AF37; color: #002f60; padding: 12px 30px;
+                          text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    Go to My Sabbatical Planning Page
+                </a>
+                <p style="color: #ddd; margin: 15px 0 0 0; font-size: 0.9em;">Complete your planning checklist to receive final approval.</p>
+            </div>
+        """,
+    'Approved': f"""
+            <div style="background-color: #22c55e; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
+                <p style="color: white; margin: 0 0 15px 0; font-size: 1.1em;">Your sabbatical is confirmed!</p>
+                <a href="{MY_SABBATICAL_URL}"
+                   style="display: inline-block; background-color: white; color: #22c55e; padding: 12px 30px;
+                          text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    View My Sabbatical Details
+                </a>
+            </div>
+        """,
+}
+
+
 def send_application_confirmation(application):
     """Send confirmation email to applicant when they submit."""
+    if not EMAIL_ENABLED:
+        return
+
     subject = f"Sabbatical Application Received - {application['application_id']}"
 
     option_info = SABBATICAL_OPTIONS.get(application['sabbatical_option'], {})
@@ -248,19 +621,13 @@ def send_application_confirmation(application):
             </ul>
 
             <div style="background-color: #e47727; border-radius: 8px; padding: 15px; margin: 20px 0; text-align: center;">
-                <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical"
+                <a href="{MY_SABBATICAL_URL}"
                    style="color: white; text-decoration: none; font-weight: bold;">
                     Check Your Application Status
                 </a>
             </div>
 
-            <p style="color: #666; font-size: 0.9em; margin-top: 30px;">Questions? Contact talent@firstlineschools.org</p>
-        </div>
-        <div style="background-color: #002f60; padding: 15px; text-align: center;">
-            <p style="color: white; margin: 0; font-size: 0.9em;">FirstLine Schools - Education For Life</p>
-        </div>
-    </div>
-    """
+{EMAIL_FOOTER_HTML}"""
     # CC the supervisor chain (CEO only for her direct reports)
     supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(application.get('employee_email', '')))
     cc_emails = [s.get('email') for s in supervisor_chain if s.get('email')]
@@ -270,6 +637,9 @@ def send_application_confirmation(application):
 
 def send_new_application_alert(application):
     """Send alert to Talent team when a new application is submitted."""
+    if not EMAIL_ENABLED:
+        return
+
     option_info = SABBATICAL_OPTIONS.get(application['sabbatical_option'], {})
     weeks = option_info.get('weeks', 'N/A')
     salary_pct = option_info.get('salary_pct', 'N/A')
@@ -323,53 +693,28 @@ def send_new_application_alert(application):
     send_email(TALENT_TEAM_EMAIL, subject, html_body, cc_emails=[SABBATICAL_ADMIN_EMAIL])
 
 
+def send_new_application_emails(application):
+    """
+    Send the applicant confirmation and the Talent team alert one after the other,
+    so both go out over the same pooled SMTP session.
+    """
+    send_application_confirmation(application)
+    send_new_application_alert(application)
+
+
 def send_status_update(application, old_status, new_status, updated_by, notes=''):
     """Send status update email to applicant."""
-    status_messages = {
-        'Tentatively Approved': "Great news! Your sabbatical application has been TENTATIVELY APPROVED! Please complete your planning checklist to receive final approval.",
-        'Approved': "Congratulations! Your sabbatical application has received FINAL APPROVAL! Your sabbatical dates are now confirmed.",
-        'Denied': f"After careful consideration, we are unable to approve your sabbatical request at this time.{' Notes: ' + notes if notes else ''}",
-        'Withdrawn': "Your sabbatical application has been withdrawn as requested."
-    }
+    if not EMAIL_ENABLED:
+        return
 
-    message = status_messages.get(new_status, f"Your application status has been updated to: {new_status}")
-
-    # Choose color based on status
-    if new_status == 'Approved':
-        status_color = '#22c55e'  # Green
-    elif new_status == 'Tentatively Approved':
-        status_color = '#6B46C1'  # Purple
-    elif new_status in ['Denied', 'Withdrawn']:
-        status_color = '#ef4444'  # Red
+    if new_status == 'Denied':
+        message = f"{STATUS_UPDATE_MESSAGES['Denied']}{' Notes: ' + notes if notes else ''}"
     else:
-        status_color = '#e47727'  # Orange
+        message = STATUS_UPDATE_MESSAGES.get(new_status, f"Your application status has been updated to: {new_status}")
+    status_color = STATUS_UPDATE_COLORS.get(new_status, '#e47727')  # Orange by default
 
     subject = f"Sabbatical Application Update - {new_status}"
-    # Add planning page link for tentatively approved applications
-    planning_link = ""
-    if new_status == 'Tentatively Approved':
-        planning_link = f"""
-            <div style="background-color: #6B46C1; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
-                <p style="color: white; margin: 0 0 15px 0; font-size: 1.1em;">Start planning your sabbatical now!</p>
-                <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical"
-                   style="display: inline-block; background-color: #D4AF37; color: #002f60; padding: 12px 30px;
-                          text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    Go to My Sabbatical Planning Page
-                </a>
-                <p style="color: #ddd; margin: 15px 0 0 0; font-size: 0.9em;">Complete your planning checklist to receive final approval.</p>
-            </div>
-        """
-    elif new_status == 'Approved':
-        planning_link = f"""
-            <div style="background-color: #22c55e; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
-                <p style="color: white; margin: 0 0 15px 0; font-size: 1.1em;">Your sabbatical is confirmed!</p>
-                <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical"
-                   style="display: inline-block; background-color: white; color: #22c55e; padding: 12px 30px;
-                          text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    View My Sabbatical Details
-                </a>
-            </div>
-        """
+    planning_link = STATUS_PLANNING_LINKS.get(new_status, '')
 
     html_body = f"""
     <div style="font-family: 'Open Sans', Arial, sans-serif; max-width: 600px; margin: 0 auto;">
@@ -393,13 +738,7 @@ def send_status_update(application, old_status, new_status, updated_by, notes=''
                 <p style="margin: 5px 0;"><strong>Preferred Dates:</strong> {application.get('start_date', '')} - {application.get('end_date', '')}</p>
             </div>
 
-            <p style="color: #666; font-size: 0.9em; margin-top: 30px;">Questions? Contact talent@firstlineschools.org</p>
-        </div>
-        <div style="background-color: #002f60; padding: 15px; text-align: center;">
-            <p style="color: white; margin: 0; font-size: 0.9em;">FirstLine Schools - Education For Life</p>
-        </div>
-    </div>
-    """
+{EMAIL_FOOTER_HTML}"""
     # For Tentatively Approved, CC the supervisor chain (CEO only for her direct reports)
     cc_emails = None
     if new_status == 'Tentatively Approved':
@@ -411,6 +750,345 @@ def send_status_update(application, old_status, new_status, updated_by, notes=''
     send_email(application['employee_email'], subject, html_body, cc_emails=cc_emails)
 
 
+def send_sabbatical_message_email(sabbatical, data, user, email):
+    """Forward a My Sabbatical message to the chosen recipient."""
+    if not EMAIL_ENABLED:
+        return
+
+    recipient_emails = {
+        'manager': sabbatical.get('manager_email', ''),  # Would need to store this
+        'hr': 'hr@firstlineschools.org',
+        'benefits': 'benefits@firstlineschools.org',
+        'payroll': 'payroll@firstlineschools.org',
+        'talent': 'talent@firstlineschools.org'
+    }
+    to_email = recipient_emails.get(data.get('recipient'), '')
+    if to_email:
+        subject = f"Sabbatical Message from {user.get('name', '')} - {sabbatical.get('employee_name', '')}"
+        html_body = f"""
+        <div style="font-family: Arial, sans-serif; max-width: 600px;">
+            <h2>New Sabbatical Message</h2>
+            <p><strong>From:</strong> {user.get('name', '')} ({email})</p>
+            <p><strong>Regarding:</strong> {sabbatical.get('employee_name', '')}'s Sabbatical</p>
+            <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 15px 0;">
+                {data.get('message', '')}
+            </div>
+            <p><a href="{MY_SABBATICAL_URL}">View in Sabbatical Portal</a></p>
+        </div>
+        """
+        send_email(to_email, subject, html_body)
+
+
+def send_date_change_request_email(sabbatical, data, approval_link):
+    """Notify the Talent team (CC admin and supervisor chain) of a date change request."""
+    if not EMAIL_ENABLED:
+        return
+
+    subject = f"Sabbatical Date Change Request - {sabbatical.get('employee_name', '')}"
+    html_body = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px;">
+        <h2 style="color: #1e3a5f;">Sabbatical Date Change Request</h2>
+        <p><strong>{sabbatical.get('employee_name', '')}</strong> has requested a date change for their sabbatical.</p>
+
+        <table style="width: 100%; border-collapse: collapse; margin: 15px 0;">
+            <tr>
+                <th style="text-align: left; padding: 8px; background: #f5f5f5;">Current Dates</th>
+                <td style="padding: 8px;">{sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</td>
+            </tr>
+            <tr>
+                <th style="text-align: left; padding: 8px; background: #f5f5f5;">Requested Dates</th>
+                <td style="padding: 8px; color: #e47727; font-weight: bold;">{data.get('new_start_date', 'TBD')} - {data.get('new_end_date', 'TBD')}</td>
+            </tr>
+            <tr>
+                <th style="text-align: left; padding: 8px; background: #f5f5f5;">Reason</th>
+                <td style="padding: 8px;">{data.get('reason', 'No reason provided')}</td>
+            </tr>
+        </table>
+
+        <p style="margin-top: 20px;">
+            <a href="{approval_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                Review Date Change Request
+            </a>
+        </p>
+    </div>
+    """
+    # Get supervisor chain emails for CC (CEO only for her direct reports)
+    supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
+    cc_list = [SABBATICAL_ADMIN_EMAIL] + [s['email'] for s in supervisor_chain if s.get('email')]
+
+    send_email(TALENT_TEAM_EMAIL, subject, html_body, cc_emails=cc_list)
+
+
+def send_date_change_decision_email(dcr, action, portal_url):
+    """Tell the employee (CC admin, Talent and supervisor chain) whether their date change was approved."""
+    if not EMAIL_ENABLED:
+        return
+
+    sabbatical = get_application_by_id(dcr.application_id)
+
+    if sabbatical:
+        # Get supervisor chain for CC (CEO only for her direct reports)
+        supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
+        cc_list = [SABBATICAL_ADMIN_EMAIL, TALENT_TEAM_EMAIL] + [s['email'] for s in supervisor_chain if s.get('email')]
+
+        planning_link = f"{portal_url}/my-sabbatical"
+
+        if action == 'approve':
+            subject = f"Sabbatical Date Change Approved - {sabbatical.get('employee_name', '')}"
+            html_body = f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px;">
+                <h2 style="color: #22c55e;">Date Change Approved</h2>
+                <p><strong>{sabbatical.get('employee_name', '')}'s</strong> sabbatical date change request has been approved.</p>
+                <p><strong>New Dates:</strong> {dcr.new_start_date} - {dcr.new_end_date}</p>
+                <p>Please continue with sabbatical planning.</p>
+                <p style="margin-top: 20px;">
+                    <a href="{planning_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                        Go to My Sabbatical Plan
+                    </a>
+                </p>
+            </div>
+            """
+        else:
+            subject = f"Sabbatical Date Change Request Denied - {sabbatical.get('employee_name', '')}"
+            html_body = f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px;">
+                <h2 style="color: #ef4444;">Date Change Request Denied</h2>
+                <p><strong>{sabbatical.get('employee_name', '')}'s</strong> sabbatical date change request was not approved at this time.</p>
+                <p>Please contact the Talent team if you have questions.</p>
+                <p style="margin-top: 20px;">
+                    <a href="{planning_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                        Go to My Sabbatical Plan
+                    </a>
+                </p>
+            </div>
+            """
+        send_email(sabbatical.get('employee_email', ''), subject, html_body, cc_emails=cc_list)
+
+
+def send_plan_approval_requests(sabbatical, approvers, email):
+    """Ask each approver to review a submitted sabbatical plan."""
+    if not EMAIL_ENABLED:
+        return
+
+    approver_list = ', '.join([a['name'] for a in approvers])
+    subject = f"Sabbatical Plan Approval Required - {sabbatical.get('employee_name', '')}"
+    for approver in approvers:
+        html_body = f"""
+        <div style="font-family: Arial, sans-serif; max-width: 600px;">
+            <div style="background-color: #6B46C1; padding: 20px; text-align: center;">
+                <h1 style="color: white; margin: 0;">Sabbatical Plan Approval</h1>
+            </div>
+            <div style="padding: 20px; background-color: #f8f9fa;">
+                <p>Hi {approver['name']},</p>
+                <p><strong>{sabbatical.get('employee_name', '')}</strong> has submitted their sabbatical plan for final approval.</p>
+
+                <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
+                    <p style="margin: 5px 0;"><strong>Employee:</strong> {sabbatical.get('employee_name', '')}</p>
+                    <p style="margin: 5px 0;"><strong>Dates:</strong> {sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</p>
+                    <p style="margin: 5px 0;"><strong>Your Role:</strong> {approver['role']}</p>
+                </div>
+
+                <p>Please review the plan and provide your approval.</p>
+
+                <div style="text-align: center; margin: 20px 0;">
+                    <a href="{MY_SABBATICAL_URL}?email={email}"
+                       style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
+                              text-decoration: none; border-radius: 5px; font-weight: bold;">
+                        Review & Approve Plan
+                    </a>
+                </div>
+
+                <p style="color: #666; font-size: 0.9em;">Other approvers: {approver_list}</p>
+            </div>
+        </div>
+        """
+        send_email(approver['email'], subject, html_body)
+
+
+def send_final_approval_email(sabbatical, approvers):
+    """Congratulate the employee on final approval, CC HR, Benefits, Payroll and the supervisor chain."""
+    if not EMAIL_ENABLED:
+        return
+
+    approver_names = [a.approver_name for a in approvers]
+
+    # Get supervisor chain for CC (CEO only for her direct reports)
+    supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
+    supervisor_cc = [s.get('email') for s in supervisor_chain if s.get('email')]
+
+    # Determine the plan type display
+    leave_weeks = sabbatical.get('leave_weeks', 8)
+    salary_pct = sabbatical.get('salary_percentage', 100)
+    plan_type = f"{leave_weeks} Week Plan at {salary_pct}% Salary"
+
+    # Format dates nicely
+    start_date = sabbatical.get('start_date', 'TBD')
+    end_date = sabbatical.get('end_date', 'TBD')
+
+    # Get employee's first name for a personal touch
+    employee_name = sabbatical.get('employee_name', '')
+    first_name = employee_name.split()[0] if employee_name else 'Team Member'
+
+    subject = f"Congratulations! Your Sabbatical is Officially Approved - {employee_name}"
+    html_body = f"""
+    <div style="font-family: 'Open Sans', Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); padding: 40px 20px; text-align: center;">
+            <div style="font-size: 48px; margin-bottom: 10px;">🎉</div>
+            <h1 style="color: white; margin: 0; font-size: 28px;">Congratulations, {first_name}!</h1>
+            <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Your sabbatical has been officially approved!</p>
+        </div>
+        <div style="padding: 30px; background-color: #f8f9fa;">
+            <p style="font-size: 16px; line-height: 1.6;">Dear {first_name},</p>
+
+            <p style="font-size: 16px; line-height: 1.6;">We are thrilled to inform you that your sabbatical plan has received <strong>final approval</strong> from all parties! This is a wonderful milestone, and we want to thank you for all the thoughtful planning and preparation you've put into making this possible.</p>
+
+            <p style="font-size: 16px; line-height: 1.6;">Your dedication to FirstLine Schools over the years has earned you this well-deserved time for rest, renewal, and personal growth. We hope this sabbatical brings you everything you're looking for.</p>
+
+            <div style="background-color: #002f60; border-radius: 12px; padding: 25px; margin: 25px 0; color: white;">
+                <h2 style="margin: 0 0 20px 0; color: white; font-size: 18px; text-align: center;">Your Approved Sabbatical Details</h2>
+                <table style="width: 100%; color: white; border-collapse: collapse;">
+                    <tr>
+                        <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2);"><strong>Duration:</strong></td>
+                        <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2); text-align: right; font-size: 18px; font-weight: bold;">{leave_weeks} Weeks</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2);"><strong>Salary:</strong></td>
+                        <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2); text-align: right; font-size: 18px; font-weight: bold;">{salary_pct}%</td>
+                    </tr>
+                    <tr style="background-color: rgba(228,119,39,0.3);">
+                        <td style="padding: 15px 10px; border-radius: 8px 0 0 0;"><strong>Start Date:</strong></td>
+                        <td style="padding: 15px 10px; text-align: right; font-size: 20px; font-weight: bold; border-radius: 0 8px 0 0;">{start_date}</td>
+                    </tr>
+                    <tr style="background-color: rgba(228,119,39,0.3);">
+                        <td style="padding: 15px 10px; border-radius: 0 0 0 8px;"><strong>End Date:</strong></td>
+                        <td style="padding: 15px 10px; text-align: right; font-size: 20px; font-weight: bold; border-radius: 0 0 8px 0;">{end_date}</td>
+                    </tr>
+                </table>
+            </div>
+
+            <div style="background-color: white; border-radius: 8px; padding: 20px; margin: 20px 0; border-left: 4px solid #22c55e;">
+                <p style="margin: 0 0 10px 0; font-weight: bold; color: #002f60;">What happens next?</p>
+                <ul style="margin: 0; padding-left: 20px; color: #666;">
+                    <li style="margin-bottom: 8px;">HR, Benefits, and Payroll have been notified and will update your records</li>
+                    <li style="margin-bottom: 8px;">Continue any final handoff preparations with your coverage team</li>
+                    <li style="margin-bottom: 8px;">Enjoy your well-earned time away!</li>
+                </ul>
+            </div>
+
+            <p style="font-size: 16px; line-height: 1.6;">Thank you for your continued commitment to our students and community. We look forward to welcoming you back refreshed and renewed!</p>
+
+            <p style="font-size: 16px; line-height: 1.6; margin-bottom: 5px;">Warm regards,</p>
+            <p style="font-size: 16px; line-height: 1.6; margin-top: 0;"><strong>The FirstLine Schools Talent Team</strong></p>
+
+            <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 25px 0;">
+
+            <p style="font-size: 12px; color: #888; margin: 0;"><strong>Approved by:</strong> {', '.join(approver_names)}</p>
+            <p style="font-size: 12px; color: #888; margin: 5px 0 0 0;">CC: HR, Benefits, Payroll, and Management Chain</p>
+        </div>
+        <div style="background-color: #002f60; padding: 20px; text-align: center;">
+            <p style="color: white; margin: 0; font-size: 14px;">FirstLine Schools - Education For Life</p>
+        </div>
+    </div>
+    """
+
+    # Send TO the employee, CC everyone else
+    cc_list = [HR_EMAIL, BENEFITS_EMAIL, PAYROLL_EMAIL, SABBATICAL_ADMIN_EMAIL] + supervisor_cc
+    employee_email = sabbatical.get('employee_email')
+
+    if employee_email:
+        send_email(employee_email, subject, html_body, cc_emails=cc_list)
+
+
+def send_changes_requested_email(sabbatical, user, approver_email, comments):
+    """Tell the employee that an approver has requested changes to their plan."""
+    if not EMAIL_ENABLED:
+        return
+
+    subject = f"Changes Requested - Sabbatical Plan"
+    html_body = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px;">
+        <div style="background-color: #eab308; padding: 20px; text-align: center;">
+            <h1 style="color: white; margin: 0;">Changes Requested</h1>
+        </div>
+        <div style="padding: 20px; background-color: #f8f9fa;">
+            <p>Hi {sabbatical.get('employee_name', '')},</p>
+            <p><strong>{user.get('name', approver_email)}</strong> has requested changes to your sabbatical plan.</p>
+
+            <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
+                <p style="margin: 5px 0;"><strong>Reviewer:</strong> {user.get('name', approver_email)}</p>
+                <p style="margin: 5px 0;"><strong>Comments:</strong></p>
+                <p style="margin: 5px 0; font-style: italic; color: #666;">"{comments}"</p>
+            </div>
+
+            <p>Please review the feedback and update your plan, then resubmit for approval.</p>
+
+            <div style="text-align: center; margin: 20px 0;">
+                <a href="{MY_SABBATICAL_URL}"
+                   style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
+                          text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    View Your Plan
+                </a>
+            </div>
+        </div>
+    </div>
+    """
+    send_email(sabbatical.get('employee_email'), subject, html_body)
+
+
+def send_plan_resubmitted_emails(application_id):
+    """Let every approver know a plan was updated and resubmitted."""
+    if not EMAIL_ENABLED:
+        return
+
+    approvals_table = f"{PROJECT_ID}.{DATASET_ID}.plan_approvals"
+    sabbatical = get_application_by_id(application_id)
+
+    # Get all approvers
+    approvers_query = f"""
+    SELECT approver_email, approver_name, approver_role
+    FROM `{approvals_table}`
+    WHERE application_id = @application_id
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("application_id", "STRING", application_id),
+        ]
+    )
+    approvers = list(bq_client.query(approvers_query, job_config=job_config).result())
+
+    # Notify all approvers
+    for approver in approvers:
+        subject = f"Plan Resubmitted - {sabbatical.get('employee_name', '')}"
+        html_body = f"""
+        <div style="font-family: Arial, sans-serif; max-width: 600px;">
+            <div style="background-color: #6B46C1; padding: 20px; text-align: center;">
+                <h1 style="color: white; margin: 0;">Plan Resubmitted</h1>
+            </div>
+            <div style="padding: 20px; background-color: #f8f9fa;">
+                <p>Hi {approver.approver_name},</p>
+                <p><strong>{sabbatical.get('employee_name', '')}</strong> has updated and resubmitted their sabbatical plan for approval.</p>
+
+                <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
+                    <p style="margin: 5px 0;"><strong>Employee:</strong> {sabbatical.get('employee_name', '')}</p>
+                    <p style="margin: 5px 0;"><strong>Dates:</strong> {sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</p>
+                    <p style="margin: 5px 0;"><strong>Your Role:</strong> {approver.approver_role}</p>
+                </div>
+
+                <p>Please review the updated plan and provide your approval.</p>
+
+                <div style="text-align: center; margin: 20px 0;">
+                    <a href="{MY_SABBATICAL_URL}?email={sabbatical.get('employee_email', '')}"
+                       style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
+                              text-decoration: none; border-radius: 5px; font-weight: bold;">
+                        Review & Approve
+                    </a>
+                </div>
+            </div>
+        </div>
+        """
+        send_email(approver.approver_email, subject, html_body)
+
+
 # ============ Supervisor Chain Functions ============
 
 def get_supervisor_chain(employee_email):
@@ -419,50 +1097,32 @@ def get_supervisor_chain(employee_email):
     Returns list of dicts with supervisor name, email, and level.
     """
     try:
-        query = f"""
-        WITH RECURSIVE supervisor_chain AS (
-            -- Base case: the employee
-            SELECT
-                Email_Address as email,
-                CONCAT(First_Name, ' ', Last_Name) as name,
-                Supervisor_Name__Unsecured_ as supervisor_name,
-                0 as level
-            FROM `{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function`
-            WHERE LOWER(Email_Address) = LOWER(@employee_email)
-            AND Employment_Status IN ('Active', 'Leave of absence')
-
-            UNION ALL
-
-            -- Recursive case: find the supervisor's supervisor
-            SELECT
-                s.Email_Address as email,
-                CONCAT(s.First_Name, ' ', s.Last_Name) as name,
-                s.Supervisor_Name__Unsecured_ as supervisor_name,
-                sc.level + 1 as level
-            FROM `{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function` s
-            INNER JOIN supervisor_chain sc
-                ON s.Employee_Name__Last_Suffix__First_MI_ = sc.supervisor_name
-            WHERE s.Employment_Status IN ('Active', 'Leave of absence')
-            AND sc.level < 10  -- Safety limit
-        )
-        SELECT DISTINCT email, name, supervisor_name, level
-        FROM supervisor_chain
-        WHERE level > 0  -- Exclude the employee themselves
-        ORDER BY level
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("employee_email", "STRING", employee_email)
-            ]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
+        roster = get_staff_roster()
+        employee = get_staff_member(employee_email, active_only=True)
+        if not employee:
+            return []
+
         chain = []
-        for row in results:
-            chain.append({
-                'email': row.email,
-                'name': row.name,
-                'level': row.level
-            })
+        seen = set()
+        current_level = [employee]
+        for level in range(1, SUPERVISOR_CHAIN_MAX_LEVELS + 1):
+            next_level = {}
+            for person in current_level:
+                for supervisor in roster['by_name_key'].get(person['Supervisor_Name__Unsecured_'], []):
+                    next_level[id(supervisor)] = supervisor
+                    first, last = supervisor['First_Name'], supervisor['Last_Name']
+                    name = f"{first} {last}" if first is not None and last is not None else None
+                    key = (supervisor['Email_Address'], name, supervisor['Supervisor_Name__Unsecured_'], level)
+                    if key not in seen:
+                        seen.add(key)
+                        chain.append({
+                            'email': supervisor['Email_Address'],
+                            'name': name,
+                            'level': level
+                        })
+            if not next_level:
+                break
+            current_level = list(next_level.values())
         return chain
     except Exception as e:
         logger.error(f"Error getting supervisor chain: {e}")
@@ -472,7 +1132,8 @@ def get_supervisor_chain(employee_email):
 def filter_chain_for_notifications(chain):
     """Filter CEO from supervisor chain unless they are a direct report (level 1).
     CEO should only be notified for her direct reports' sabbaticals."""
-    return [s for s in chain if s.get('email', '').lower() != CEO_EMAIL.lower() or s.get('level') == 1]
+    ceo_email = CEO_EMAIL.lower()
+    return [s for s in chain if s.get('email', '').lower() != ceo_email or s.get('level') == 1]
 
 
 def get_required_approvers(employee_email):
@@ -518,8 +1179,20 @@ def get_full_table_id():
     return f"{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}"
 
 
+# Applications are looked up by employee email and filtered by status
+APPLICATIONS_CLUSTERING_FIELDS = ['employee_email', 'status']
+
+
+# Set once the applications table has been checked/created by this process
+_applications_table_ready = False
+
+
 def ensure_table_exists():
-    """Create the BigQuery table if it doesn't exist."""
+    """Create the BigQuery table if it doesn't exist (checked once per process)."""
+    global _applications_table_ready
+    if _applications_table_ready:
+        return True
+
     try:
         table_id = get_full_table_id()
 
@@ -536,6 +1209,7 @@ def ensure_table_exists():
         # Check if table exists
         try:
             bq_client.get_table(table_id)
+            _applications_table_ready = True
             return True
         except Exception:
             pass
@@ -567,85 +1241,153 @@ def ensure_table_exists():
         ]
 
         table = bigquery.Table(table_id, schema=schema)
+        # Cluster on the columns lookups filter by
+        table.clustering_fields = APPLICATIONS_CLUSTERING_FIELDS
         bq_client.create_table(table)
         logger.info(f"Created table {table_id}")
+        _applications_table_ready = True
         return True
     except Exception as e:
         logger.error(f"Error ensuring table exists: {e}")
         return False
 
 
+# Text columns passed through as-is (NULL becomes '')
+APPLICATION_TEXT_FIELDS = (
+    'employee_name', 'employee_email', 'preferred_dates', 'sabbatical_purpose', 'why_now',
+    'coverage_plan', 'status', 'status_updated_by', 'admin_notes'
+)
+
+
 def row_to_dict(row):
-    """Convert a BigQuery row to a dictionary."""
+    """Convert a BigQuery row (Row or plain dict) to an application dictionary."""
+    if not isinstance(row, dict):
+        # One pass over the Row so every lookup below is a plain dict probe
+        row = dict(row.items())
+
     # Handle both old and new column names
-    leave_weeks = getattr(row, 'leave_weeks', None) or 8
-    salary_pct = getattr(row, 'salary_percentage', None) or 100
-    sabbatical_option = getattr(row, 'sabbatical_option', None) or f"{leave_weeks} Weeks - {salary_pct}% Salary"
+    leave_weeks = row.get('leave_weeks') or 8
+    salary_pct = row.get('salary_percentage') or 100
+    sabbatical_option = row.get('sabbatical_option') or f"{leave_weeks} Weeks - {salary_pct}% Salary"
 
     # Get start/end dates (handle both column name formats)
-    start_date = getattr(row, 'start_date', None) or getattr(row, 'requested_start_date', None)
-    end_date = getattr(row, 'end_date', None) or getattr(row, 'requested_end_date', None)
+    start_date = row.get('start_date') or row.get('requested_start_date')
+    end_date = row.get('end_date') or row.get('requested_end_date')
 
     # Get flexibility info
-    is_flexible = getattr(row, 'flexible', None)
-    date_flexibility = getattr(row, 'date_flexibility', None)
+    is_flexible = row.get('flexible')
+    date_flexibility = row.get('date_flexibility')
     if date_flexibility is None and is_flexible is not None:
         date_flexibility = 'Yes' if is_flexible else 'No'
 
-    flexibility_explanation = getattr(row, 'flexibility_explanation', None) or getattr(row, 'flexibility_details', None) or ''
+    flexibility_explanation = row.get('flexibility_explanation') or row.get('flexibility_details') or ''
 
     # Get manager discussion
-    manager_discussed = getattr(row, 'manager_discussed', None)
-    manager_discussion = getattr(row, 'manager_discussion', None)
+    manager_discussed = row.get('manager_discussed')
+    manager_discussion = row.get('manager_discussion')
     if manager_discussion is None and manager_discussed is not None:
         manager_discussion = 'Yes' if manager_discussed else 'No'
 
     # Get location/site
-    location = getattr(row, 'employee_location', None) or getattr(row, 'site', None) or ''
+    location = row.get('employee_location') or row.get('site') or ''
 
     # Get notes
-    additional_notes = getattr(row, 'additional_notes', None) or getattr(row, 'additional_comments', None) or ''
+    additional_notes = row.get('additional_notes') or row.get('additional_comments') or ''
 
     # Get status timestamp
-    status_updated_at = getattr(row, 'status_updated_at', None) or getattr(row, 'updated_at', None)
+    status_updated_at = row.get('status_updated_at') or row.get('updated_at')
 
-    return {
-        'application_id': row.application_id,
-        'submitted_at': row.submitted_at.isoformat() if row.submitted_at else '',
-        'employee_name': row.employee_name or '',
-        'employee_email': row.employee_email or '',
+    application = {
+        'application_id': row['application_id'],
+        'submitted_at': row['submitted_at'].isoformat() if row['submitted_at'] else '',
+    }
+    for field in APPLICATION_TEXT_FIELDS:
+        application[field] = row.get(field) or ''
+    application.update({
         'employee_location': location,
         'sabbatical_option': sabbatical_option,
         'leave_weeks': leave_weeks,
         'salary_percentage': salary_pct,
-        'preferred_dates': getattr(row, 'preferred_dates', None) or '',
         'start_date': start_date.isoformat() if start_date else '',
         'end_date': end_date.isoformat() if end_date else '',
         'date_flexibility': date_flexibility or '',
         'flexibility_explanation': flexibility_explanation,
-        'sabbatical_purpose': getattr(row, 'sabbatical_purpose', None) or '',
-        'why_now': getattr(row, 'why_now', None) or '',
-        'coverage_plan': getattr(row, 'coverage_plan', None) or '',
         'manager_discussion': manager_discussion or '',
-        'ack_one_year': getattr(row, 'ack_one_year', False),
-        'ack_no_other_job': getattr(row, 'ack_no_other_job', False),
+        'ack_one_year': row.get('ack_one_year', False),
+        'ack_no_other_job': row.get('ack_no_other_job', False),
         'additional_notes': additional_notes,
-        'status': row.status or '',
         'status_updated_at': status_updated_at.isoformat() if status_updated_at else '',
-        'status_updated_by': getattr(row, 'status_updated_by', None) or '',
-        'admin_notes': getattr(row, 'admin_notes', None) or ''
-    }
+    })
+    return application
+
+
+# Application reads (SELECT * because row_to_dict handles old and new column names)
+ALL_APPLICATIONS_QUERY = f"""
+SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+ORDER BY submitted_at DESC
+"""
+APPLICATIONS_BY_EMAIL_QUERY = f"""
+SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+WHERE LOWER(TRIM(employee_email)) IN UNNEST(@emails)
+ORDER BY submitted_at DESC
+"""
+APPLICATION_BY_ID_QUERY = f"""
+SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+WHERE application_id = @application_id
+"""
+
+# Admin lists, stats and the calendar all read the full applications table; keep the last
+# read for a few seconds so page loads and polling don't each run a BigQuery job.
+# Writes through this app clear it right away.
+APPLICATIONS_CACHE_TTL = int(os.environ.get('APPLICATIONS_CACHE_TTL', 15))
+
+_applications_cache = {'loaded_at': 0, 'data': None, 'generation': 0}
+_applications_cache_lock = threading.Lock()
+
+
+def invalidate_applications_cache():
+    """Drop the cached applications list after a write."""
+    with _applications_cache_lock:
+        _applications_cache['data'] = None
+        _applications_cache['generation'] += 1
 
 
 def read_all_applications():
-    """Read all applications from BigQuery."""
+    """Read all applications from BigQuery (cached for APPLICATIONS_CACHE_TTL seconds)."""
+    with _applications_cache_lock:
+        data = _applications_cache['data']
+        generation = _applications_cache['generation']
+        if data is not None and time.time() - _applications_cache['loaded_at'] < APPLICATIONS_CACHE_TTL:
+            # Callers modify the dicts they get back, so hand out copies
+            return [dict(a) for a in data]
+
     try:
         ensure_table_exists()
-        query = f"""
-        SELECT * FROM `{get_full_table_id()}`
-        ORDER BY submitted_at DESC
-        """
-        results = bq_client.query(query).result()
+        # Full-table read: fetch as Arrow over the BigQuery Storage API rather than paging JSON rows
+        rows = bq_client.query(ALL_APPLICATIONS_QUERY).result().to_arrow(bqstorage_client=bqstorage_client).to_pylist()
+        data = [row_to_dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Error reading applications: {e}")
+        return []
+
+    with _applications_cache_lock:
+        # Don't store a read that raced with a write
+        if _applications_cache['generation'] == generation:
+            _applications_cache['data'] = data
+            _applications_cache['loaded_at'] = time.time()
+    return [dict(a) for a in data]
+
+
+def read_applications_by_email(emails):
+    """Read the applications for any of the given lowercased employee emails, newest first."""
+    try:
+        ensure_table_exists()
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("emails", "STRING", list(emails))
+            ]
+        )
+        results = bq_client.query(APPLICATIONS_BY_EMAIL_QUERY, job_config=job_config).result()
         return [row_to_dict(row) for row in results]
     except Exception as e:
         logger.error(f"Error reading applications: {e}")
@@ -655,19 +1397,14 @@ def read_all_applications():
 def get_application_by_id(application_id):
     """Get a single application by ID."""
     try:
-        query = f"""
-        SELECT * FROM `{get_full_table_id()}`
-        WHERE application_id = @application_id
-        """
         job_config = bigquery.QueryJobConfig(
             query_parameters=[
                 bigquery.ScalarQueryParameter("application_id", "STRING", application_id)
             ]
         )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            return row_to_dict(row)
-        return None
+        # Point lookup: query_and_wait returns the row with the job instead of a separate fetch
+        row = next(iter(bq_client.query_and_wait(APPLICATION_BY_ID_QUERY, job_config=job_config, max_results=1)), None)
+        return row_to_dict(row) if row is not None else None
     except Exception as e:
         logger.error(f"Error getting application: {e}")
         return None
@@ -708,12 +1445,12 @@ def append_application(application_data):
         end_date = None
         if application_data.get('start_date'):
             try:
-                start_date = datetime.strptime(application_data['start_date'], '%Y-%m-%d').date()
+                start_date = date.fromisoformat(application_data['start_date'])
             except:
                 pass
         if application_data.get('end_date'):
             try:
-                end_date = datetime.strptime(application_data['end_date'], '%Y-%m-%d').date()
+                end_date = date.fromisoformat(application_data['end_date'])
             except:
                 pass
 
@@ -750,12 +1487,40 @@ def append_application(application_data):
         )
 
         bq_client.query(query, job_config=job_config).result()
+        invalidate_applications_cache()
         return True
     except Exception as e:
         logger.error(f"Error appending application: {e}")
         return False
 
 
+# Column types for update_application parameters (anything else is STRING)
+APPLICATION_COLUMN_TYPES = {
+    'start_date': 'DATE',
+    'end_date': 'DATE',
+    'updated_at': 'TIMESTAMP',
+    'flexible': 'BOOL',
+    'manager_discussed': 'BOOL',
+    'leave_weeks': 'INT64',
+    'salary_percentage': 'INT64',
+}
+
+
+def to_param_value(param_type, value):
+    """Convert an update value (often an ISO string from JSON) to the Python type for a query parameter."""
+    if param_type == 'BOOL':
+        return bool(value)
+    if value is None or value == '':
+        return None
+    if param_type == 'DATE':
+        return date.fromisoformat(value) if isinstance(value, str) else value
+    if param_type == 'TIMESTAMP':
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+    if param_type == 'INT64':
+        return int(value)
+    return str(value)
+
+
 def update_application(application_id, updates):
     """Update an application in BigQuery."""
     try:
@@ -776,19 +1541,9 @@ def update_application(application_id, updates):
                 continue  # Skip fields that don't exist in table
 
             param_name = f"param_{actual_field}"
-
-            if actual_field == 'updated_at':
-                set_clauses.append(f"{actual_field} = @{param_name}")
-                if isinstance(value, str):
-                    params.append(bigquery.ScalarQueryParameter(param_name, "TIMESTAMP", datetime.fromisoformat(value)))
-                else:
-                    params.append(bigquery.ScalarQueryParameter(param_name, "TIMESTAMP", value))
-            elif actual_field in ['flexible', 'manager_discussed']:
-                set_clauses.append(f"{actual_field} = @{param_name}")
-                params.append(bigquery.ScalarQueryParameter(param_name, "BOOL", bool(value)))
-            else:
-                set_clauses.append(f"{actual_field} = @{param_name}")
-                params.append(bigquery.ScalarQueryParameter(param_name, "STRING", str(value)))
+            param_type = APPLICATION_COLUMN_TYPES.get(actual_field, 'STRING')
+            set_clauses.append(f"{actual_field} = @{param_name}")
+            params.append(bigquery.ScalarQueryParameter(param_name, param_type, to_param_value(param_type, value)))
 
         if not set_clauses:
             return True
@@ -801,6 +1556,7 @@ def update_application(application_id, updates):
 
         job_config = bigquery.QueryJobConfig(query_parameters=params)
         bq_client.query(query, job_config=job_config).result()
+        invalidate_applications_cache()
 
         return True
     except Exception as e:
@@ -819,12 +1575,13 @@ def require_admin(f):
         if not user:
             return jsonify({'error': 'Authentication required'}), 401
 
-        access = get_sabbatical_admin_access(user.get('email', ''))
+        access = get_session_admin_access(user)
         if access['level'] == 'none':
             return jsonify({'error': 'Admin access required'}), 403
 
-        # Store access info for use in the route
-        user['admin_access'] = access
+        # Handlers read the checked access from g instead of re-resolving it
+        g.admin_access = access
+
         return f(*args, **kwargs)
     return decorated_function
 
@@ -837,11 +1594,13 @@ def require_network_admin(f):
         if not user:
             return jsonify({'error': 'Authentication required'}), 401
 
-        access = get_sabbatical_admin_access(user.get('email', ''))
+        access = get_session_admin_access(user)
         if access['level'] != 'network':
             return jsonify({'error': 'Network admin access required'}), 403
 
-        user['admin_access'] = access
+        # Handlers read the checked access from g instead of re-resolving it
+        g.admin_access = access
+
         return f(*args, **kwargs)
     return decorated_function
 
@@ -850,10 +1609,19 @@ def require_network_admin(f):
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) if '__file__' in dir() else os.getcwd()
 
+# Let browsers reuse the HTML pages briefly; after that send_file's ETag turns reloads into 304s
+PAGE_MAX_AGE = int(os.environ.get('PAGE_MAX_AGE', 300))
+
+
+def send_page(filename):
+    """Serve one of the app's HTML pages."""
+    return send_file(os.path.join(SCRIPT_DIR, filename), max_age=PAGE_MAX_AGE)
+
+
 @app.route('/')
 def index():
     """Serve the main HTML page."""
-    return send_file(os.path.join(SCRIPT_DIR, 'index.html'))
+    return send_page('index.html')
 
 
 @app.route('/api/applications', methods=['POST'])
@@ -877,7 +1645,7 @@ def submit_application():
             return jsonify({'error': 'You must acknowledge all required statements'}), 400
 
         # Generate application ID and timestamps
-        application_id = str(uuid.uuid4())[:8].upper()
+        application_id = secrets.token_hex(4).upper()
         submitted_at = datetime.now().isoformat()
 
         # Build application record
@@ -885,7 +1653,7 @@ def submit_application():
             'application_id': application_id,
             'submitted_at': submitted_at,
             'employee_name': data.get('employee_name', ''),
-            'employee_email': data.get('employee_email', '').lower(),
+            'employee_email': data.get('employee_email', '').lower().strip(),
             'employee_location': data.get('employee_location', ''),
             'sabbatical_option': data.get('sabbatical_option', ''),
             'preferred_dates': data.get('preferred_dates', ''),
@@ -907,9 +1675,8 @@ def submit_application():
         }
 
         if append_application(application):
-            # Send email notifications
-            send_application_confirmation(application)
-            send_new_application_alert(application)
+            # Send email notifications in the background
+            queue_email(send_new_application_emails, application)
 
             return jsonify({
                 'success': True,
@@ -932,7 +1699,7 @@ def lookup_applications():
         return jsonify({'error': 'Authentication required. Please sign in to view your application status.'}), 401
 
     user_email = user.get('email', '').lower()
-    is_admin = user.get('is_admin') or (get_sabbatical_admin_access(user_email)['level'] != 'none')
+    is_admin = get_session_admin_access(user)['level'] != 'none'
 
     email = request.args.get('email', '').lower().strip()
 
@@ -947,13 +1714,8 @@ def lookup_applications():
     # Resolve email alias to primary email for lookups
     primary_email = resolve_email_alias(email).lower()
 
-    all_applications = read_all_applications()
-
-    # Filter to applications by this email (check both original and primary)
-    user_applications = [
-        a for a in all_applications
-        if a.get('employee_email', '').lower() in [email, primary_email]
-    ]
+    # Applications by this email (check both original and primary)
+    user_applications = read_applications_by_email({email, primary_email})
 
     # Remove admin-only fields
     for a in user_applications:
@@ -964,6 +1726,42 @@ def lookup_applications():
     })
 
 
+def get_staff_profile(email):
+    """
+    Build the staff profile and sabbatical eligibility for an email from the cached roster.
+    Returns None if the email isn't in the staff list.
+    """
+    primary_email = resolve_email_alias(email).lower()
+    row = get_staff_member(primary_email)
+    if not row:
+        return None
+
+    # Use preferred name if available, otherwise first name
+    display_name = row['Preferred_First_Name'] or row['First_Name']
+    full_name = f"{display_name} {row['Last_Name']}"
+    years = row['years_of_service'] or 0
+
+    # Calculate eligibility (10+ years required)
+    is_eligible = years >= SABBATICAL_MIN_YEARS or email.lower() in TEST_ELIGIBLE_EMAILS
+
+    # Format hire date
+    hire_date = row['Last_Hire_Date'].strftime('%B %d, %Y') if row['Last_Hire_Date'] else 'Unknown'
+
+    return {
+        'found': True,
+        'name': full_name,
+        'first_name': display_name,
+        'last_name': row['Last_Name'],
+        'job_title': row['Job_Title'] or '',
+        'location': row['Location_Name'] or '',
+        'hire_date': hire_date,
+        'years_of_service': years,
+        'is_eligible': is_eligible,
+        'eligibility_message': f"You have {years} years of service at FirstLine Schools." if is_eligible
+            else f"You have {years} years of service. The sabbatical program requires {SABBATICAL_MIN_YEARS}+ years of continuous service."
+    }
+
+
 @app.route('/api/staff/lookup', methods=['GET'])
 def lookup_staff():
     """Look up staff info by email and check eligibility."""
@@ -975,70 +1773,21 @@ def lookup_staff():
     # Resolve email alias to primary email for lookups
     primary_email = resolve_email_alias(email).lower()
 
-    # Look up staff in staff_master_list_with_function
     try:
-        query = f"""
-        SELECT
-            First_Name,
-            Last_Name,
-            Preferred_First_Name,
-            Email_Address,
-            Job_Title,
-            Location_Name,
-            Last_Hire_Date,
-            Employment_Status,
-            DATE_DIFF(CURRENT_DATE(), DATE(Last_Hire_Date), YEAR) as years_of_service
-        FROM `{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function`
-        WHERE LOWER(Email_Address) = @email
-        AND (Employment_Status IS NULL OR Employment_Status != 'Terminated')
-        LIMIT 1
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("email", "STRING", primary_email)
-            ]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-
-        for row in results:
-            # Use preferred name if available, otherwise first name
-            display_name = row.Preferred_First_Name or row.First_Name
-            full_name = f"{display_name} {row.Last_Name}"
-            years = row.years_of_service or 0
-
-            # Calculate eligibility (10+ years required)
-            # Test override for system testing
-            TEST_ELIGIBLE_EMAILS = ['sshirey@firstlineschools.org']
-            is_eligible = years >= 10 or email in TEST_ELIGIBLE_EMAILS
-
-            # Format hire date
-            hire_date = row.Last_Hire_Date.strftime('%B %d, %Y') if row.Last_Hire_Date else 'Unknown'
+        profile = get_staff_profile(email)
+        if profile:
+            return jsonify(profile)
 
+        # Not found in staff list - check previous applications as fallback
+        previous_applications = read_applications_by_email({email, primary_email})
+        if previous_applications:
             return jsonify({
                 'found': True,
-                'name': full_name,
-                'first_name': display_name,
-                'last_name': row.Last_Name,
-                'job_title': row.Job_Title or '',
-                'location': row.Location_Name or '',
-                'hire_date': hire_date,
-                'years_of_service': years,
-                'is_eligible': is_eligible,
-                'eligibility_message': f"You have {years} years of service at FirstLine Schools." if is_eligible
-                    else f"You have {years} years of service. The sabbatical program requires 10+ years of continuous service."
+                'name': previous_applications[0].get('employee_name', ''),
+                'is_eligible': None,  # Can't determine
+                'eligibility_message': 'Unable to verify years of service. Please contact HR.'
             })
 
-        # Not found in staff list - check previous applications as fallback
-        all_applications = read_all_applications()
-        for a in all_applications:
-            if a.get('employee_email', '').lower() in [email, primary_email]:
-                return jsonify({
-                    'found': True,
-                    'name': a.get('employee_name', ''),
-                    'is_eligible': None,  # Can't determine
-                    'eligibility_message': 'Unable to verify years of service. Please contact HR.'
-                })
-
         return jsonify({
             'found': False,
             'is_eligible': False,
@@ -1053,7 +1802,10 @@ def lookup_staff():
 @app.route('/api/options', methods=['GET'])
 def get_options():
     """Get sabbatical options."""
-    return jsonify({'options': list(SABBATICAL_OPTIONS.keys())})
+    response = jsonify({'options': SABBATICAL_OPTION_NAMES})
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_LIST_MAX_AGE
+    return response
 
 
 # ============ Conflict Check & Calendar ============
@@ -1074,7 +1826,7 @@ def check_conflicts():
     conflicts = []
     for app in all_applications:
         # Only check approved or in-progress applications
-        if app.get('status') not in ['Approved', 'Tentatively Approved', 'Plan Submitted', 'Submitted']:
+        if app.get('status') not in SCHEDULED_STATUSES:
             continue
 
         # Check if same location
@@ -1129,7 +1881,7 @@ def get_calendar_data():
     # Filter to applications with dates that are approved or in-progress
     calendar_data = []
     for app in all_applications:
-        if app.get('status') in ['Approved', 'Tentatively Approved', 'Plan Submitted', 'Submitted']:
+        if app.get('status') in SCHEDULED_STATUSES:
             calendar_data.append({
                 'application_id': app.get('application_id'),
                 'employee_name': app.get('employee_name'),
@@ -1157,8 +1909,16 @@ def get_calendar_data():
 
 # ============ My Sabbatical Routes ============
 
+# Set once the My Sabbatical tables have been checked/created by this process
+_my_sabbatical_tables_ready = False
+
+
 def ensure_my_sabbatical_tables():
-    """Create My Sabbatical tables if they don't exist."""
+    """Create My Sabbatical tables if they don't exist (checked once per process)."""
+    global _my_sabbatical_tables_ready
+    if _my_sabbatical_tables_ready:
+        return True
+
     try:
         # Checklist items table
         checklist_table = f"{PROJECT_ID}.{DATASET_ID}.checklist_items"
@@ -1268,46 +2028,262 @@ def ensure_my_sabbatical_tables():
             bq_client.create_table(table)
             logger.info(f"Created table {date_changes_table}")
 
+        _my_sabbatical_tables_ready = True
         return True
     except Exception as e:
-        logger.error(f"Error creating My Sabbatical tables: {e}")
-        return False
+        logger.error(f"Error creating My Sabbatical tables: {e}")
+        return False
+
+
+# History rows are never updated or deleted, so they are queued here and streamed in
+# batches by a background thread instead of costing each request its own write
+HISTORY_BATCH_SIZE = int(os.environ.get('HISTORY_BATCH_SIZE', 50))
+HISTORY_FLUSH_INTERVAL = float(os.environ.get('HISTORY_FLUSH_INTERVAL', 1.0))
+HISTORY_TABLE_ID = f"{PROJECT_ID}.{DATASET_ID}.activity_history"
+history_queue = queue.Queue()
+_history_flush_lock = threading.Lock()
+_history_batch_ready = threading.Event()
+
+# Per-application history reads are kept (LRU) for HISTORY_CACHE_TTL seconds. Writes through
+# this process drop the entry right away; the TTL bounds staleness from other instances
+HISTORY_CACHE_SIZE = int(os.environ.get('HISTORY_CACHE_SIZE', 512))
+HISTORY_CACHE_TTL = int(os.environ.get('HISTORY_CACHE_TTL', 30))
+_history_cache = {'generation': 0, 'entries': OrderedDict()}
+_history_cache_lock = threading.Lock()
+
+
+def invalidate_history_cache(application_ids):
+    """Drop cached history for the given applications."""
+    with _history_cache_lock:
+        for application_id in application_ids:
+            _history_cache['entries'].pop(application_id, None)
+        _history_cache['generation'] += 1
+
+
+def flush_activity_history():
+    """Stream every queued history row to BigQuery."""
+    with _history_flush_lock:
+        batch = []
+        while True:
+            try:
+                batch.append(history_queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= HISTORY_BATCH_SIZE:
+                _insert_history_rows(batch)
+                batch = []
+        if batch:
+            _insert_history_rows(batch)
+
+
+def _insert_history_rows(rows):
+    try:
+        errors = bq_client.insert_rows_json(HISTORY_TABLE_ID, rows)
+        if errors:
+            logger.error(f"Error adding activity: {errors}")
+    except Exception as e:
+        logger.error(f"Error adding activity: {e}")
+    # Reads made while these rows were queued may have cached history without them
+    invalidate_history_cache({row['application_id'] for row in rows})
+
+
+def _history_writer():
+    """Flush history every HISTORY_FLUSH_INTERVAL seconds, or sooner once a batch fills up."""
+    while True:
+        _history_batch_ready.wait(HISTORY_FLUSH_INTERVAL)
+        _history_batch_ready.clear()
+        flush_activity_history()
+
+
+threading.Thread(target=_history_writer, name='history-writer', daemon=True).start()
+# Cloud Run sends SIGTERM before stopping an instance; gunicorn exits cleanly and runs this
+atexit.register(flush_activity_history)
+
+
+def add_activity(application_id, user_email, user_name, action, description):
+    """Queue an activity for the history."""
+    history_queue.put_nowait({
+        'id': str(uuid.uuid4())[:8],
+        'application_id': application_id,
+        'timestamp': datetime.now().isoformat(),
+        'user_email': user_email,
+        'user_name': user_name,
+        'action': action,
+        'description': description,
+    })
+    invalidate_history_cache([application_id])
+    if history_queue.qsize() >= HISTORY_BATCH_SIZE:
+        _history_batch_ready.set()
+
+
+# My Sabbatical detail queries, keyed by @application_id
+CHECKLIST_ITEMS_QUERY = f"""
+SELECT task_id, employee_done, manager_done, hr_done, notes_json
+FROM `{PROJECT_ID}.{DATASET_ID}.checklist_items`
+WHERE application_id = @application_id
+"""
+COVERAGE_ASSIGNMENTS_QUERY = f"""
+SELECT id, responsibility, covered_by, email, status, notes
+FROM `{PROJECT_ID}.{DATASET_ID}.coverage_assignments`
+WHERE application_id = @application_id
+ORDER BY created_at
+"""
+PLAN_LINKS_QUERY = f"""
+SELECT id, title, url, created_at
+FROM `{PROJECT_ID}.{DATASET_ID}.plan_links`
+WHERE application_id = @application_id
+ORDER BY created_at
+"""
+MESSAGES_QUERY = f"""
+SELECT id, from_name, from_email, message, sent_at, read
+FROM `{PROJECT_ID}.{DATASET_ID}.messages`
+WHERE application_id = @application_id
+ORDER BY sent_at DESC
+"""
+ACTIVITY_HISTORY_QUERY = f"""
+SELECT timestamp, description
+FROM `{PROJECT_ID}.{DATASET_ID}.activity_history`
+WHERE application_id = @application_id
+ORDER BY timestamp DESC
+LIMIT 50
+"""
+
+
+def read_checklist_items(application_id):
+    """Get checklist items for an application."""
+    checklist = []
+    try:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
+        )
+        results = bq_client.query(CHECKLIST_ITEMS_QUERY, job_config=job_config).result()
+        for row in results:
+            notes = []
+            if row.notes_json:
+                try:
+                    notes = json.loads(row.notes_json)
+                except:
+                    pass
+            checklist.append({
+                'task_id': row.task_id,
+                'employee_done': row.employee_done or False,
+                'manager_done': row.manager_done or False,
+                'hr_done': row.hr_done or False,
+                'notes': notes
+            })
+    except Exception as e:
+        logger.error(f"Error loading checklist: {e}")
+    return checklist
+
+
+def read_coverage_assignments(application_id):
+    """Get coverage assignments for an application."""
+    coverage = []
+    try:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
+        )
+        results = bq_client.query(COVERAGE_ASSIGNMENTS_QUERY, job_config=job_config).result()
+        for row in results:
+            coverage.append({
+                'id': row.id,
+                'responsibility': row.responsibility,
+                'covered_by': row.covered_by,
+                'email': row.email or '',
+                'status': row.status or 'Pending',
+                'notes': row.notes or ''
+            })
+    except Exception as e:
+        logger.error(f"Error loading coverage: {e}")
+    return coverage
+
+
+def read_plan_links(application_id):
+    """Get plan links for an application."""
+    plan_links = []
+    try:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
+        )
+        results = bq_client.query(PLAN_LINKS_QUERY, job_config=job_config).result()
+        for row in results:
+            plan_links.append({
+                'id': row.id,
+                'title': row.title,
+                'url': row.url,
+                'created_at': row.created_at.isoformat() if row.created_at else ''
+            })
+    except Exception as e:
+        logger.error(f"Error loading plan links: {e}")
+    return plan_links
+
+
+def read_messages(application_id):
+    """Get messages for an application, newest first."""
+    messages = []
+    try:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
+        )
+        results = bq_client.query(MESSAGES_QUERY, job_config=job_config).result()
+        for row in results:
+            messages.append({
+                'id': row.id,
+                'from_name': row.from_name,
+                'from_email': row.from_email,
+                'message': row.message,
+                'sent_at': row.sent_at.isoformat() if row.sent_at else '',
+                'unread': not row.read
+            })
+    except Exception as e:
+        logger.error(f"Error loading messages: {e}")
+    return messages
 
 
-def add_activity(application_id, user_email, user_name, action, description):
-    """Add an activity to the history."""
+def read_activity_history(application_id):
+    """Get the 50 most recent activity entries for an application (cached for HISTORY_CACHE_TTL seconds)."""
+    with _history_cache_lock:
+        entry = _history_cache['entries'].get(application_id)
+        if entry is not None and time.time() - entry['loaded_at'] < HISTORY_CACHE_TTL:
+            _history_cache['entries'].move_to_end(application_id)
+            return list(entry['data'])
+        generation = _history_cache['generation']
+
+    history = []
     try:
-        history_table = f"{PROJECT_ID}.{DATASET_ID}.activity_history"
-        query = f"""
-        INSERT INTO `{history_table}` (id, application_id, timestamp, user_email, user_name, action, description)
-        VALUES (@id, @application_id, @timestamp, @user_email, @user_name, @action, @description)
-        """
         job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("id", "STRING", str(uuid.uuid4())[:8]),
-                bigquery.ScalarQueryParameter("application_id", "STRING", application_id),
-                bigquery.ScalarQueryParameter("timestamp", "TIMESTAMP", datetime.now()),
-                bigquery.ScalarQueryParameter("user_email", "STRING", user_email),
-                bigquery.ScalarQueryParameter("user_name", "STRING", user_name),
-                bigquery.ScalarQueryParameter("action", "STRING", action),
-                bigquery.ScalarQueryParameter("description", "STRING", description),
-            ]
+            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
         )
-        bq_client.query(query, job_config=job_config).result()
+        results = bq_client.query(ACTIVITY_HISTORY_QUERY, job_config=job_config).result()
+        for row in results:
+            history.append({
+                'timestamp': row.timestamp.isoformat() if row.timestamp else '',
+                'description': row.description
+            })
     except Exception as e:
-        logger.error(f"Error adding activity: {e}")
+        logger.error(f"Error loading history: {e}")
+        return history
+
+    with _history_cache_lock:
+        # Don't store a read that raced with a history write
+        if _history_cache['generation'] == generation:
+            _history_cache['entries'][application_id] = {'loaded_at': time.time(), 'data': history}
+            _history_cache['entries'].move_to_end(application_id)
+            if len(_history_cache['entries']) > HISTORY_CACHE_SIZE:
+                _history_cache['entries'].popitem(last=False)
+    return list(history)
 
 
 @app.route('/my-sabbatical')
 def my_sabbatical_page():
     """Serve the My Sabbatical page."""
-    return send_file(os.path.join(SCRIPT_DIR, 'my-sabbatical.html'))
+    return send_page('my-sabbatical.html')
 
 
 @app.route('/approvals')
 def approvals_page():
     """Serve the Approvals page."""
-    return send_file(os.path.join(SCRIPT_DIR, 'approvals.html'))
+    return send_page('approvals.html')
 
 
 @app.route('/api/my-approvals', methods=['GET'])
@@ -1376,7 +2352,7 @@ def get_my_sabbatical():
     # Check if admin or supervisor is viewing another employee's sabbatical
     requested_email = request.args.get('email', '').lower()
     user_email = user.get('email', '').lower()
-    is_admin = user.get('is_admin') or (get_sabbatical_admin_access(user_email)['level'] != 'none')
+    is_admin = get_session_admin_access(user)['level'] != 'none'
 
     if requested_email and requested_email != user_email:
         # Check if user is admin OR a supervisor of the requested employee
@@ -1402,16 +2378,16 @@ def get_my_sabbatical():
     ensure_my_sabbatical_tables()
 
     # Find approved/planning sabbatical for this user
-    all_applications = read_all_applications()
-    logger.info(f"Looking for sabbatical for email: {email} (primary: {primary_email}), found {len(all_applications)} total applications")
+    user_applications = read_applications_by_email(emails_to_check)
+    logger.info(f"Looking for sabbatical for email: {email} (primary: {primary_email}), found {len(user_applications)} applications")
 
     sabbatical = None
-    for app in all_applications:
+    for app in user_applications:
         app_email = app.get('employee_email', '').lower()
         app_status = app.get('status', '')
         if app_email in emails_to_check:
             logger.info(f"Found matching email: {app_email}, status: {app_status}")
-            if app_status in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+            if app_status in MY_SABBATICAL_STATUSES:
                 sabbatical = app
                 break
 
@@ -1421,142 +2397,26 @@ def get_my_sabbatical():
 
     application_id = sabbatical['application_id']
 
-    # Look up years of service from staff table
+    # Look up years of service from the staff roster
     try:
-        yos_query = f"""
-        SELECT DATE_DIFF(CURRENT_DATE(), DATE(Last_Hire_Date), YEAR) as years_of_service
-        FROM `{PROJECT_ID}.talent_grow_observations.staff_master_list_with_function`
-        WHERE LOWER(Email_Address) = @email
-        AND Employment_Status IN ('Active', 'Leave of absence')
-        LIMIT 1
-        """
-        yos_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("email", "STRING", primary_email)]
-        )
-        yos_result = list(bq_client.query(yos_query, job_config=yos_config).result())
-        if yos_result:
-            sabbatical['years_of_service'] = yos_result[0].years_of_service
+        staff_member = get_staff_member(primary_email, active_only=True)
+        if staff_member:
+            sabbatical['years_of_service'] = staff_member['years_of_service']
     except Exception as e:
         logger.error(f"Error looking up years of service: {e}")
 
-    # Get checklist items
-    checklist = []
-    try:
-        query = f"""
-        SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.checklist_items`
-        WHERE application_id = @application_id
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            notes = []
-            if row.notes_json:
-                try:
-                    notes = json.loads(row.notes_json)
-                except:
-                    pass
-            checklist.append({
-                'task_id': row.task_id,
-                'employee_done': row.employee_done or False,
-                'manager_done': row.manager_done or False,
-                'hr_done': row.hr_done or False,
-                'notes': notes
-            })
-    except Exception as e:
-        logger.error(f"Error loading checklist: {e}")
-
-    # Get coverage assignments
-    coverage = []
-    try:
-        query = f"""
-        SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.coverage_assignments`
-        WHERE application_id = @application_id
-        ORDER BY created_at
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            coverage.append({
-                'id': row.id,
-                'responsibility': row.responsibility,
-                'covered_by': row.covered_by,
-                'email': row.email or '',
-                'status': row.status or 'Pending',
-                'notes': row.notes or ''
-            })
-    except Exception as e:
-        logger.error(f"Error loading coverage: {e}")
-
-    # Get plan links
-    plan_links = []
-    try:
-        query = f"""
-        SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.plan_links`
-        WHERE application_id = @application_id
-        ORDER BY created_at
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            plan_links.append({
-                'id': row.id,
-                'title': row.title,
-                'url': row.url,
-                'created_at': row.created_at.isoformat() if row.created_at else ''
-            })
-    except Exception as e:
-        logger.error(f"Error loading plan links: {e}")
-
-    # Get messages
-    messages = []
-    try:
-        query = f"""
-        SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.messages`
-        WHERE application_id = @application_id
-        ORDER BY sent_at DESC
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            messages.append({
-                'id': row.id,
-                'from_name': row.from_name,
-                'from_email': row.from_email,
-                'message': row.message,
-                'sent_at': row.sent_at.isoformat() if row.sent_at else '',
-                'unread': not row.read
-            })
-    except Exception as e:
-        logger.error(f"Error loading messages: {e}")
+    # These lookups are independent, so run them concurrently
+    checklist_future = query_executor.submit(read_checklist_items, application_id)
+    coverage_future = query_executor.submit(read_coverage_assignments, application_id)
+    plan_links_future = query_executor.submit(read_plan_links, application_id)
+    messages_future = query_executor.submit(read_messages, application_id)
+    history_future = query_executor.submit(read_activity_history, application_id)
 
-    # Get activity history
-    history = []
-    try:
-        query = f"""
-        SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.activity_history`
-        WHERE application_id = @application_id
-        ORDER BY timestamp DESC
-        LIMIT 50
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[bigquery.ScalarQueryParameter("application_id", "STRING", application_id)]
-        )
-        results = bq_client.query(query, job_config=job_config).result()
-        for row in results:
-            history.append({
-                'timestamp': row.timestamp.isoformat() if row.timestamp else '',
-                'description': row.description
-            })
-    except Exception as e:
-        logger.error(f"Error loading history: {e}")
+    checklist = checklist_future.result()
+    coverage = coverage_future.result()
+    plan_links = plan_links_future.result()
+    messages = messages_future.result()
+    history = history_future.result()
 
     return jsonify({
         'found': True,
@@ -1592,18 +2452,18 @@ def update_checklist_item(task_id):
     db_role = 'employee' if role == 'completed' else role
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     application_id = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
-            if app.get('status') in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+            if app.get('status') in MY_SABBATICAL_STATUSES:
                 application_id = app['application_id']
                 break
 
     # Also allow managers/HR to update for any sabbatical they can access
     if not application_id:
         # Check if admin/HR
-        if get_sabbatical_admin_access(email)['level'] != 'none':
+        if get_session_admin_access(user)['level'] != 'none':
             # Get application_id from query param
             application_id = request.args.get('application_id')
 
@@ -1624,9 +2484,9 @@ def update_checklist_item(task_id):
                 bigquery.ScalarQueryParameter("task_id", "STRING", task_id),
             ]
         )
-        results = list(bq_client.query(query, job_config=job_config).result())
+        existing = next(iter(bq_client.query_and_wait(query, job_config=job_config, max_results=1)), None)
 
-        if results:
+        if existing is not None:
             # Update existing
             update_query = f"""
             UPDATE `{checklist_table}`
@@ -1682,11 +2542,11 @@ def add_checklist_note(task_id):
         return jsonify({'error': 'Note text required'}), 400
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     application_id = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
-            if app.get('status') in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+            if app.get('status') in MY_SABBATICAL_STATUSES:
                 application_id = app['application_id']
                 break
 
@@ -1707,7 +2567,7 @@ def add_checklist_note(task_id):
                 bigquery.ScalarQueryParameter("task_id", "STRING", task_id),
             ]
         )
-        results = list(bq_client.query(query, job_config=job_config).result())
+        existing = next(iter(bq_client.query_and_wait(query, job_config=job_config, max_results=1)), None)
 
         new_note = {
             'author': user.get('name', email),
@@ -1715,12 +2575,12 @@ def add_checklist_note(task_id):
             'timestamp': datetime.now().isoformat()
         }
 
-        if results:
+        if existing is not None:
             # Update existing
             existing_notes = []
-            if results[0].notes_json:
+            if existing.notes_json:
                 try:
-                    existing_notes = json.loads(results[0].notes_json)
+                    existing_notes = json.loads(existing.notes_json)
                 except:
                     pass
             existing_notes.append(new_note)
@@ -1777,11 +2637,11 @@ def add_coverage():
     data = request.json
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     application_id = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
-            if app.get('status') in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+            if app.get('status') in MY_SABBATICAL_STATUSES:
                 application_id = app['application_id']
                 break
 
@@ -1925,11 +2785,11 @@ def add_plan_link():
 
     try:
         # Find application for this user
-        all_applications = read_all_applications()
+        user_applications = read_applications_by_email(emails_to_check)
         application = None
-        for app in all_applications:
+        for app in user_applications:
             if app.get('employee_email', '').lower() in emails_to_check:
-                if app.get('status') in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+                if app.get('status') in MY_SABBATICAL_STATUSES:
                     application = app
                     break
 
@@ -2059,12 +2919,12 @@ def send_sabbatical_message():
     data = request.json
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     application_id = None
     sabbatical = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
-            if app.get('status') in ['Tentatively Approved', 'Plan Submitted', 'Approved', 'Planning', 'Confirmed', 'On Sabbatical', 'Returning', 'Completed']:
+            if app.get('status') in MY_SABBATICAL_STATUSES:
                 application_id = app['application_id']
                 sabbatical = app
                 break
@@ -2095,28 +2955,7 @@ def send_sabbatical_message():
         bq_client.query(query, job_config=job_config).result()
 
         # Send email notification to recipient
-        recipient_emails = {
-            'manager': sabbatical.get('manager_email', ''),  # Would need to store this
-            'hr': 'hr@firstlineschools.org',
-            'benefits': 'benefits@firstlineschools.org',
-            'payroll': 'payroll@firstlineschools.org',
-            'talent': 'talent@firstlineschools.org'
-        }
-        to_email = recipient_emails.get(data.get('recipient'), '')
-        if to_email:
-            subject = f"Sabbatical Message from {user.get('name', '')} - {sabbatical.get('employee_name', '')}"
-            html_body = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                <h2>New Sabbatical Message</h2>
-                <p><strong>From:</strong> {user.get('name', '')} ({email})</p>
-                <p><strong>Regarding:</strong> {sabbatical.get('employee_name', '')}'s Sabbatical</p>
-                <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 15px 0;">
-                    {data.get('message', '')}
-                </div>
-                <p><a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical">View in Sabbatical Portal</a></p>
-            </div>
-            """
-            send_email(to_email, subject, html_body)
+        queue_email(send_sabbatical_message_email, sabbatical, data, user, email)
 
         # Add activity
         add_activity(application_id, email, user.get('name', ''), 'message_sent',
@@ -2142,10 +2981,10 @@ def request_date_change():
     data = request.json
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     application_id = None
     sabbatical = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
             if app.get('status') in ['Tentatively Approved', 'Approved', 'Planning', 'Confirmed']:
                 application_id = app['application_id']
@@ -2160,10 +2999,10 @@ def request_date_change():
         request_id = str(uuid.uuid4())[:8]
 
         # Parse dates
-        old_start = datetime.strptime(sabbatical['start_date'], '%Y-%m-%d').date() if sabbatical.get('start_date') else None
-        old_end = datetime.strptime(sabbatical['end_date'], '%Y-%m-%d').date() if sabbatical.get('end_date') else None
-        new_start = datetime.strptime(data['new_start_date'], '%Y-%m-%d').date() if data.get('new_start_date') else None
-        new_end = datetime.strptime(data['new_end_date'], '%Y-%m-%d').date() if data.get('new_end_date') else None
+        old_start = date.fromisoformat(sabbatical['start_date']) if sabbatical.get('start_date') else None
+        old_end = date.fromisoformat(sabbatical['end_date']) if sabbatical.get('end_date') else None
+        new_start = date.fromisoformat(data['new_start_date']) if data.get('new_start_date') else None
+        new_end = date.fromisoformat(data['new_end_date']) if data.get('new_end_date') else None
 
         query = f"""
         INSERT INTO `{date_changes_table}` (
@@ -2196,39 +3035,7 @@ def request_date_change():
         portal_url = request.host_url.rstrip('/')
         approval_link = f"{portal_url}/approvals?date_change={request_id}"
 
-        subject = f"Sabbatical Date Change Request - {sabbatical.get('employee_name', '')}"
-        html_body = f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px;">
-            <h2 style="color: #1e3a5f;">Sabbatical Date Change Request</h2>
-            <p><strong>{sabbatical.get('employee_name', '')}</strong> has requested a date change for their sabbatical.</p>
-
-            <table style="width: 100%; border-collapse: collapse; margin: 15px 0;">
-                <tr>
-                    <th style="text-align: left; padding: 8px; background: #f5f5f5;">Current Dates</th>
-                    <td style="padding: 8px;">{sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</td>
-                </tr>
-                <tr>
-                    <th style="text-align: left; padding: 8px; background: #f5f5f5;">Requested Dates</th>
-                    <td style="padding: 8px; color: #e47727; font-weight: bold;">{data.get('new_start_date', 'TBD')} - {data.get('new_end_date', 'TBD')}</td>
-                </tr>
-                <tr>
-                    <th style="text-align: left; padding: 8px; background: #f5f5f5;">Reason</th>
-                    <td style="padding: 8px;">{data.get('reason', 'No reason provided')}</td>
-                </tr>
-            </table>
-
-            <p style="margin-top: 20px;">
-                <a href="{approval_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
-                    Review Date Change Request
-                </a>
-            </p>
-        </div>
-        """
-        # Get supervisor chain emails for CC (CEO only for her direct reports)
-        supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
-        cc_list = [SABBATICAL_ADMIN_EMAIL] + [s['email'] for s in supervisor_chain if s.get('email')]
-
-        send_email(TALENT_TEAM_EMAIL, subject, html_body, cc_emails=cc_list)
+        queue_email(send_date_change_request_email, sabbatical, data, approval_link)
 
         # Add activity
         add_activity(application_id, email, user.get('name', ''), 'date_change_requested',
@@ -2306,20 +3113,19 @@ def process_date_change_request(request_id):
 
         # Get the date change request
         query = f"""
-        SELECT * FROM `{date_changes_table}` WHERE id = @request_id
+        SELECT application_id, new_start_date, new_end_date
+        FROM `{date_changes_table}` WHERE id = @request_id
         """
         job_config = bigquery.QueryJobConfig(
             query_parameters=[
                 bigquery.ScalarQueryParameter("request_id", "STRING", request_id)
             ]
         )
-        results = list(bq_client.query(query, job_config=job_config).result())
+        dcr = next(iter(bq_client.query_and_wait(query, job_config=job_config, max_results=1)), None)
 
-        if not results:
+        if dcr is None:
             return jsonify({'error': 'Request not found'}), 404
 
-        dcr = results[0]
-
         if action == 'approve':
             # Update the application with new dates
             update_application(dcr.application_id, {
@@ -2357,47 +3163,7 @@ def process_date_change_request(request_id):
         bq_client.query(update_query, job_config=job_config).result()
 
         # Send notification to employee
-        all_applications = read_all_applications()
-        sabbatical = next((a for a in all_applications if a['application_id'] == dcr.application_id), None)
-
-        if sabbatical:
-            # Get supervisor chain for CC (CEO only for her direct reports)
-            supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
-            cc_list = [SABBATICAL_ADMIN_EMAIL, TALENT_TEAM_EMAIL] + [s['email'] for s in supervisor_chain if s.get('email')]
-
-            portal_url = request.host_url.rstrip('/')
-            planning_link = f"{portal_url}/my-sabbatical"
-
-            if action == 'approve':
-                subject = f"Sabbatical Date Change Approved - {sabbatical.get('employee_name', '')}"
-                html_body = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                    <h2 style="color: #22c55e;">Date Change Approved</h2>
-                    <p><strong>{sabbatical.get('employee_name', '')}'s</strong> sabbatical date change request has been approved.</p>
-                    <p><strong>New Dates:</strong> {dcr.new_start_date} - {dcr.new_end_date}</p>
-                    <p>Please continue with sabbatical planning.</p>
-                    <p style="margin-top: 20px;">
-                        <a href="{planning_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
-                            Go to My Sabbatical Plan
-                        </a>
-                    </p>
-                </div>
-                """
-            else:
-                subject = f"Sabbatical Date Change Request Denied - {sabbatical.get('employee_name', '')}"
-                html_body = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                    <h2 style="color: #ef4444;">Date Change Request Denied</h2>
-                    <p><strong>{sabbatical.get('employee_name', '')}'s</strong> sabbatical date change request was not approved at this time.</p>
-                    <p>Please contact the Talent team if you have questions.</p>
-                    <p style="margin-top: 20px;">
-                        <a href="{planning_link}" style="background-color: #1e3a5f; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
-                            Go to My Sabbatical Plan
-                        </a>
-                    </p>
-                </div>
-                """
-            send_email(sabbatical.get('employee_email', ''), subject, html_body, cc_emails=cc_list)
+        queue_email(send_date_change_decision_email, dcr, action, request.host_url.rstrip('/'))
 
         return jsonify({'success': True, 'status': new_status})
     except Exception as e:
@@ -2417,9 +3183,9 @@ def submit_plan_for_approval():
     emails_to_check = [email, primary_email] if email != primary_email else [email]
 
     # Find user's sabbatical
-    all_applications = read_all_applications()
+    user_applications = read_applications_by_email(emails_to_check)
     sabbatical = None
-    for app in all_applications:
+    for app in user_applications:
         if app.get('employee_email', '').lower() in emails_to_check:
             if app.get('status') == 'Tentatively Approved':
                 sabbatical = app
@@ -2457,77 +3223,44 @@ def submit_plan_for_approval():
             bq_client.create_table(table)
             logger.info(f"Created table {approvals_table}")
 
-        # Check if approvals already exist for this application (prevent duplicates)
-        existing_query = f"""
-        SELECT COUNT(*) as cnt FROM `{approvals_table}`
-        WHERE application_id = @application_id
+        # Insert approval records for all approvers in one statement. The NOT EXISTS guard
+        # prevents duplicates, so no rows inserted means the plan was already submitted.
+        query = f"""
+        INSERT INTO `{approvals_table}` (id, application_id, approver_email, approver_name, approver_role, approver_type, status, created_at)
+        SELECT a.id, @application_id, a.approver_email, a.approver_name, a.approver_role, a.approver_type, 'Pending', @created_at
+        FROM UNNEST(@approvers) AS a
+        WHERE NOT EXISTS (SELECT 1 FROM `{approvals_table}` WHERE application_id = @application_id)
         """
+        approver_params = [
+            bigquery.StructQueryParameter(
+                None,
+                bigquery.ScalarQueryParameter("id", "STRING", str(uuid.uuid4())[:8]),
+                # Stored lowercased so approver lookups can match the column directly
+                bigquery.ScalarQueryParameter("approver_email", "STRING", approver['email'] and approver['email'].lower()),
+                bigquery.ScalarQueryParameter("approver_name", "STRING", approver['name']),
+                bigquery.ScalarQueryParameter("approver_role", "STRING", approver['role']),
+                bigquery.ScalarQueryParameter("approver_type", "STRING", approver['type']),
+            )
+            for approver in approvers
+        ]
         job_config = bigquery.QueryJobConfig(
             query_parameters=[
                 bigquery.ScalarQueryParameter("application_id", "STRING", application_id),
+                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", datetime.now()),
+                bigquery.ArrayQueryParameter("approvers", "STRUCT", approver_params),
             ]
         )
-        existing = list(bq_client.query(existing_query, job_config=job_config).result())[0].cnt
-        if existing > 0:
+        insert_job = bq_client.query(query, job_config=job_config)
+        insert_job.result()
+        if not insert_job.num_dml_affected_rows:
             return jsonify({'error': 'Plan has already been submitted for approval'}), 400
 
-        # Insert approval records for each approver
-        for approver in approvers:
-            approval_id = str(uuid.uuid4())[:8]
-            query = f"""
-            INSERT INTO `{approvals_table}` (id, application_id, approver_email, approver_name, approver_role, approver_type, status, created_at)
-            VALUES (@id, @application_id, @approver_email, @approver_name, @approver_role, @approver_type, 'Pending', @created_at)
-            """
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("id", "STRING", approval_id),
-                    bigquery.ScalarQueryParameter("application_id", "STRING", application_id),
-                    bigquery.ScalarQueryParameter("approver_email", "STRING", approver['email']),
-                    bigquery.ScalarQueryParameter("approver_name", "STRING", approver['name']),
-                    bigquery.ScalarQueryParameter("approver_role", "STRING", approver['role']),
-                    bigquery.ScalarQueryParameter("approver_type", "STRING", approver['type']),
-                    bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", datetime.now()),
-                ]
-            )
-            bq_client.query(query, job_config=job_config).result()
-
         # Update application status to "Plan Submitted"
         update_application(application_id, {'status': 'Plan Submitted'})
 
         # Send notification to all approvers
         approver_list = ', '.join([a['name'] for a in approvers])
-        subject = f"Sabbatical Plan Approval Required - {sabbatical.get('employee_name', '')}"
-        for approver in approvers:
-            html_body = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                <div style="background-color: #6B46C1; padding: 20px; text-align: center;">
-                    <h1 style="color: white; margin: 0;">Sabbatical Plan Approval</h1>
-                </div>
-                <div style="padding: 20px; background-color: #f8f9fa;">
-                    <p>Hi {approver['name']},</p>
-                    <p><strong>{sabbatical.get('employee_name', '')}</strong> has submitted their sabbatical plan for final approval.</p>
-
-                    <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 5px 0;"><strong>Employee:</strong> {sabbatical.get('employee_name', '')}</p>
-                        <p style="margin: 5px 0;"><strong>Dates:</strong> {sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</p>
-                        <p style="margin: 5px 0;"><strong>Your Role:</strong> {approver['role']}</p>
-                    </div>
-
-                    <p>Please review the plan and provide your approval.</p>
-
-                    <div style="text-align: center; margin: 20px 0;">
-                        <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical?email={email}"
-                           style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
-                                  text-decoration: none; border-radius: 5px; font-weight: bold;">
-                            Review & Approve Plan
-                        </a>
-                    </div>
-
-                    <p style="color: #666; font-size: 0.9em;">Other approvers: {approver_list}</p>
-                </div>
-            </div>
-            """
-            send_email(approver['email'], subject, html_body)
+        queue_email(send_plan_approval_requests, sabbatical, approvers, email)
 
         # Add activity
         add_activity(application_id, email, user.get('name', ''), 'plan_submitted',
@@ -2571,13 +3304,14 @@ def approve_plan():
                 bigquery.ScalarQueryParameter("notes", "STRING", notes),
             ]
         )
-        bq_client.query(query, job_config=job_config).result()
+        update_job = bq_client.query(query, job_config=job_config)
+        update_job.result()
+        if not update_job.num_dml_affected_rows:
+            return jsonify({'error': 'No approval found for this user on this plan'}), 404
 
-        # Check if all approvals are complete
-        check_query = f"""
-        SELECT
-            COUNT(*) as total,
-            COUNTIF(status = 'Approved') as approved
+        # Fetch all approval records once - used for both the completion check and the notification
+        approvers_query = f"""
+        SELECT approver_name, status
         FROM `{approvals_table}`
         WHERE application_id = @application_id
         """
@@ -2586,124 +3320,25 @@ def approve_plan():
                 bigquery.ScalarQueryParameter("application_id", "STRING", application_id)
             ]
         )
-        results = list(bq_client.query(check_query, job_config=job_config).result())
-
-        if results:
-            total = results[0].total
-            approved = results[0].approved
-
-            # Get application details
-            sabbatical = get_application_by_id(application_id)
-
-            if approved == total and sabbatical:
-                # All approvals complete - grant final approval!
-                update_application(application_id, {'status': 'Approved'})
-
-                # Get all approvers for notification
-                approvers_query = f"""
-                SELECT approver_email, approver_name, approver_role
-                FROM `{approvals_table}`
-                WHERE application_id = @application_id
-                """
-                job_config = bigquery.QueryJobConfig(
-                    query_parameters=[
-                        bigquery.ScalarQueryParameter("application_id", "STRING", application_id)
-                    ]
-                )
-                approvers = list(bq_client.query(approvers_query, job_config=job_config).result())
-                approver_names = [a.approver_name for a in approvers]
-
-                # Get supervisor chain for CC (CEO only for her direct reports)
-                supervisor_chain = filter_chain_for_notifications(get_supervisor_chain(sabbatical.get('employee_email', '')))
-                supervisor_cc = [s.get('email') for s in supervisor_chain if s.get('email')]
-
-                # Determine the plan type display
-                leave_weeks = sabbatical.get('leave_weeks', 8)
-                salary_pct = sabbatical.get('salary_percentage', 100)
-                plan_type = f"{leave_weeks} Week Plan at {salary_pct}% Salary"
-
-                # Format dates nicely
-                start_date = sabbatical.get('start_date', 'TBD')
-                end_date = sabbatical.get('end_date', 'TBD')
-
-                # Get employee's first name for a personal touch
-                employee_name = sabbatical.get('employee_name', '')
-                first_name = employee_name.split()[0] if employee_name else 'Team Member'
-
-                subject = f"Congratulations! Your Sabbatical is Officially Approved - {employee_name}"
-                html_body = f"""
-                <div style="font-family: 'Open Sans', Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); padding: 40px 20px; text-align: center;">
-                        <div style="font-size: 48px; margin-bottom: 10px;">🎉</div>
-                        <h1 style="color: white; margin: 0; font-size: 28px;">Congratulations, {first_name}!</h1>
-                        <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Your sabbatical has been officially approved!</p>
-                    </div>
-                    <div style="padding: 30px; background-color: #f8f9fa;">
-                        <p style="font-size: 16px; line-height: 1.6;">Dear {first_name},</p>
-
-                        <p style="font-size: 16px; line-height: 1.6;">We are thrilled to inform you that your sabbatical plan has received <strong>final approval</strong> from all parties! This is a wonderful milestone, and we want to thank you for all the thoughtful planning and preparation you've put into making this possible.</p>
-
-                        <p style="font-size: 16px; line-height: 1.6;">Your dedication to FirstLine Schools over the years has earned you this well-deserved time for rest, renewal, and personal growth. We hope this sabbatical brings you everything you're looking for.</p>
-
-                        <div style="background-color: #002f60; border-radius: 12px; padding: 25px; margin: 25px 0; color: white;">
-                            <h2 style="margin: 0 0 20px 0; color: white; font-size: 18px; text-align: center;">Your Approved Sabbatical Details</h2>
-                            <table style="width: 100%; color: white; border-collapse: collapse;">
-                                <tr>
-                                    <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2);"><strong>Duration:</strong></td>
-                                    <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2); text-align: right; font-size: 18px; font-weight: bold;">{leave_weeks} Weeks</td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2);"><strong>Salary:</strong></td>
-                                    <td style="padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.2); text-align: right; font-size: 18px; font-weight: bold;">{salary_pct}%</td>
-                                </tr>
-                                <tr style="background-color: rgba(228,119,39,0.3);">
-                                    <td style="padding: 15px 10px; border-radius: 8px 0 0 0;"><strong>Start Date:</strong></td>
-                                    <td style="padding: 15px 10px; text-align: right; font-size: 20px; font-weight: bold; border-radius: 0 8px 0 0;">{start_date}</td>
-                                </tr>
-                                <tr style="background-color: rgba(228,119,39,0.3);">
-                                    <td style="padding: 15px 10px; border-radius: 0 0 0 8px;"><strong>End Date:</strong></td>
-                                    <td style="padding: 15px 10px; text-align: right; font-size: 20px; font-weight: bold; border-radius: 0 0 8px 0;">{end_date}</td>
-                                </tr>
-                            </table>
-                        </div>
-
-                        <div style="background-color: white; border-radius: 8px; padding: 20px; margin: 20px 0; border-left: 4px solid #22c55e;">
-                            <p style="margin: 0 0 10px 0; font-weight: bold; color: #002f60;">What happens next?</p>
-                            <ul style="margin: 0; padding-left: 20px; color: #666;">
-                                <li style="margin-bottom: 8px;">HR, Benefits, and Payroll have been notified and will update your records</li>
-                                <li style="margin-bottom: 8px;">Continue any final handoff preparations with your coverage team</li>
-                                <li style="margin-bottom: 8px;">Enjoy your well-earned time away!</li>
-                            </ul>
-                        </div>
-
-                        <p style="font-size: 16px; line-height: 1.6;">Thank you for your continued commitment to our students and community. We look forward to welcoming you back refreshed and renewed!</p>
-
-                        <p style="font-size: 16px; line-height: 1.6; margin-bottom: 5px;">Warm regards,</p>
-                        <p style="font-size: 16px; line-height: 1.6; margin-top: 0;"><strong>The FirstLine Schools Talent Team</strong></p>
-
-                        <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 25px 0;">
-
-                        <p style="font-size: 12px; color: #888; margin: 0;"><strong>Approved by:</strong> {', '.join(approver_names)}</p>
-                        <p style="font-size: 12px; color: #888; margin: 5px 0 0 0;">CC: HR, Benefits, Payroll, and Management Chain</p>
-                    </div>
-                    <div style="background-color: #002f60; padding: 20px; text-align: center;">
-                        <p style="color: white; margin: 0; font-size: 14px;">FirstLine Schools - Education For Life</p>
-                    </div>
-                </div>
-                """
+        approvers = list(bq_client.query(approvers_query, job_config=job_config).result())
+
+        total = len(approvers)
+        approved = sum(1 for a in approvers if a.status == 'Approved')
+
+        # Get application details
+        sabbatical = get_application_by_id(application_id)
 
-                # Send TO the employee, CC everyone else
-                cc_list = [HR_EMAIL, BENEFITS_EMAIL, PAYROLL_EMAIL, SABBATICAL_ADMIN_EMAIL] + supervisor_cc
-                employee_email = sabbatical.get('employee_email')
+        if approved == total and sabbatical:
+            # All approvals complete - grant final approval!
+            update_application(application_id, {'status': 'Approved'})
 
-                if employee_email:
-                    send_email(employee_email, subject, html_body, cc_emails=cc_list)
+            queue_email(send_final_approval_email, sabbatical, approvers)
 
-                # Add activity
-                add_activity(application_id, approver_email, user.get('name', ''), 'final_approval',
-                            f"Final approval granted. All {total} approvers signed off.")
+            # Add activity
+            add_activity(application_id, approver_email, user.get('name', ''), 'final_approval',
+                        f"Final approval granted. All {total} approvers signed off.")
 
-                return jsonify({'success': True, 'final_approval': True, 'total': total, 'approved': approved})
+            return jsonify({'success': True, 'final_approval': True, 'total': total, 'approved': approved})
 
         # Add activity for this approval
         add_activity(application_id, approver_email, user.get('name', ''), 'approval_given',
@@ -2757,35 +3392,7 @@ def request_changes():
 
         # Notify the employee
         if sabbatical:
-            subject = f"Changes Requested - Sabbatical Plan"
-            html_body = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                <div style="background-color: #eab308; padding: 20px; text-align: center;">
-                    <h1 style="color: white; margin: 0;">Changes Requested</h1>
-                </div>
-                <div style="padding: 20px; background-color: #f8f9fa;">
-                    <p>Hi {sabbatical.get('employee_name', '')},</p>
-                    <p><strong>{user.get('name', approver_email)}</strong> has requested changes to your sabbatical plan.</p>
-
-                    <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 5px 0;"><strong>Reviewer:</strong> {user.get('name', approver_email)}</p>
-                        <p style="margin: 5px 0;"><strong>Comments:</strong></p>
-                        <p style="margin: 5px 0; font-style: italic; color: #666;">"{comments}"</p>
-                    </div>
-
-                    <p>Please review the feedback and update your plan, then resubmit for approval.</p>
-
-                    <div style="text-align: center; margin: 20px 0;">
-                        <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical"
-                           style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
-                                  text-decoration: none; border-radius: 5px; font-weight: bold;">
-                            View Your Plan
-                        </a>
-                    </div>
-                </div>
-            </div>
-            """
-            send_email(sabbatical.get('employee_email'), subject, html_body)
+            queue_email(send_changes_requested_email, sabbatical, user, approver_email, comments)
 
             # Add activity
             add_activity(application_id, approver_email, user.get('name', ''), 'changes_requested',
@@ -2826,53 +3433,8 @@ def resubmit_plan():
         )
         bq_client.query(query, job_config=job_config).result()
 
-        # Get application and approvers
-        sabbatical = get_application_by_id(application_id)
-
-        # Get all approvers
-        approvers_query = f"""
-        SELECT approver_email, approver_name, approver_role
-        FROM `{approvals_table}`
-        WHERE application_id = @application_id
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("application_id", "STRING", application_id),
-            ]
-        )
-        approvers = list(bq_client.query(approvers_query, job_config=job_config).result())
-
         # Notify all approvers
-        for approver in approvers:
-            subject = f"Plan Resubmitted - {sabbatical.get('employee_name', '')}"
-            html_body = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px;">
-                <div style="background-color: #6B46C1; padding: 20px; text-align: center;">
-                    <h1 style="color: white; margin: 0;">Plan Resubmitted</h1>
-                </div>
-                <div style="padding: 20px; background-color: #f8f9fa;">
-                    <p>Hi {approver.approver_name},</p>
-                    <p><strong>{sabbatical.get('employee_name', '')}</strong> has updated and resubmitted their sabbatical plan for approval.</p>
-
-                    <div style="background-color: white; border-radius: 8px; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 5px 0;"><strong>Employee:</strong> {sabbatical.get('employee_name', '')}</p>
-                        <p style="margin: 5px 0;"><strong>Dates:</strong> {sabbatical.get('start_date', 'TBD')} - {sabbatical.get('end_date', 'TBD')}</p>
-                        <p style="margin: 5px 0;"><strong>Your Role:</strong> {approver.approver_role}</p>
-                    </div>
-
-                    <p>Please review the updated plan and provide your approval.</p>
-
-                    <div style="text-align: center; margin: 20px 0;">
-                        <a href="https://sabbatical-program-965913991496.us-central1.run.app/my-sabbatical?email={sabbatical.get('employee_email', '')}"
-                           style="display: inline-block; background-color: #6B46C1; color: white; padding: 12px 30px;
-                                  text-decoration: none; border-radius: 5px; font-weight: bold;">
-                            Review & Approve
-                        </a>
-                    </div>
-                </div>
-            </div>
-            """
-            send_email(approver.approver_email, subject, html_body)
+        queue_email(send_plan_resubmitted_emails, application_id)
 
         # Add activity
         add_activity(application_id, user.get('email', ''), user.get('name', ''), 'plan_resubmitted',
@@ -2962,9 +3524,15 @@ def auth_callback():
                 'email': user_info.get('email'),
                 'name': user_info.get('name'),
                 'picture': user_info.get('picture'),
-                'is_admin': access['level'] != 'none',
-                'admin_access': access,
+                'is_admin': False,
             }
+            # On a failed lookup leave access unset so the first request re-checks it
+            if access is not None:
+                session['user'].update({
+                    'is_admin': access['level'] != 'none',
+                    'admin_access': access,
+                    'admin_access_checked_at': time.time(),
+                })
 
         # Redirect back to where the user came from
         next_url = session.pop('login_next', '/')
@@ -2977,6 +3545,9 @@ def auth_callback():
 @app.route('/logout')
 def logout():
     """Clear session."""
+    user = session.get('user')
+    if user:
+        clear_admin_access_cache(user.get('email'))
     session.clear()
     return redirect('/')
 
@@ -2986,7 +3557,7 @@ def auth_status():
     """Check authentication status."""
     user = session.get('user')
     if user:
-        access = get_sabbatical_admin_access(user.get('email', ''))
+        access = get_session_admin_access(user)
         is_admin = access['level'] != 'none'  # Any admin level counts
         return jsonify({
             'authenticated': True,
@@ -3003,8 +3574,7 @@ def auth_status():
 @require_admin
 def get_all_applications():
     """Get applications based on admin access level."""
-    user = session.get('user', {})
-    access = user.get('admin_access', get_sabbatical_admin_access(user.get('email', '')))
+    access = g.admin_access
 
     applications = read_all_applications()
 
@@ -3027,12 +3597,10 @@ def update_application_status(application_id):
         data = request.json
         user = session.get('user', {})
 
-        # Get current application data for email notification
-        current_application = get_application_by_id(application_id)
-        old_status = current_application.get('status') if current_application else None
-
         updates = {}
         new_status = None
+        current_application = None
+        old_status = None
         notes = data.get('admin_notes', '')
 
         # Handle status update
@@ -3041,6 +3609,11 @@ def update_application_status(application_id):
             if new_status not in STATUS_VALUES:
                 return jsonify({'error': 'Invalid status'}), 400
 
+            # The current row is only needed for the status-change email, so other
+            # edits (and rejected requests) skip this lookup
+            current_application = get_application_by_id(application_id)
+            old_status = current_application.get('status') if current_application else None
+
             updates['status'] = new_status
             updates['status_updated_at'] = datetime.now().isoformat()
             updates['status_updated_by'] = user.get('email', 'Unknown')
@@ -3052,7 +3625,8 @@ def update_application_status(application_id):
         if update_application(application_id, updates):
             # Send status update email if status changed
             if new_status and old_status and new_status != old_status and current_application:
-                send_status_update(current_application, old_status, new_status, user.get('email', 'Unknown'), notes)
+                queue_email(send_status_update, current_application, old_status, new_status,
+                            user.get('email', 'Unknown'), notes)
 
             return jsonify({'success': True})
         else:
@@ -3072,9 +3646,8 @@ def resend_confirmation_email(application_id):
         if not application:
             return jsonify({'error': 'Application not found'}), 404
 
-        # Send both emails
-        send_application_confirmation(application)
-        send_new_application_alert(application)
+        # Send both emails in the background
+        queue_email(send_new_application_emails, application)
 
         return jsonify({
             'success': True,
@@ -3108,6 +3681,7 @@ def delete_application_admin(application_id):
             ]
         )
         bq_client.query(query, job_config=job_config).result()
+        invalidate_applications_cache()
 
         logger.info(f"Application {application_id} for {application.get('employee_name')} deleted by {user.get('email')}")
 
@@ -3118,12 +3692,29 @@ def delete_application_admin(application_id):
         return jsonify({'error': 'Server error'}), 500
 
 
+@app.route('/api/admin/refresh-cache', methods=['POST'])
+@require_network_admin
+def refresh_cache():
+    """Reload the staff roster and drop cached admin access and applications (network admin only)."""
+    user = session.get('user', {})
+    clear_admin_access_cache()
+    invalidate_applications_cache()
+    expire_staff_roster()
+    try:
+        roster = get_staff_roster()
+    except Exception as e:
+        logger.error(f"Error refreshing staff roster: {e}")
+        return jsonify({'error': 'Server error'}), 500
+
+    logger.info(f"Caches refreshed by {user.get('email')}")
+    return jsonify({'success': True, 'staff_count': len(roster['by_email'])})
+
+
 @app.route('/api/admin/stats', methods=['GET'])
 @require_admin
 def get_stats():
     """Get dashboard statistics based on admin access level."""
-    user = session.get('user', {})
-    access = user.get('admin_access', get_sabbatical_admin_access(user.get('email', '')))
+    access = g.admin_access
 
     applications = read_all_applications()
 
@@ -3135,24 +3726,18 @@ def get_stats():
             if (a.get('employee_location', '') or '').lower() == school
         ]
 
-    total = len(applications)
-    submitted = len([a for a in applications if a.get('status') == 'Submitted'])
-    tentatively_approved = len([a for a in applications if a.get('status') == 'Tentatively Approved'])
-    plan_submitted = len([a for a in applications if a.get('status') == 'Plan Submitted'])
-    approved = len([a for a in applications if a.get('status') == 'Approved'])
-    completed = len([a for a in applications if a.get('status') == 'Completed'])
-    denied = len([a for a in applications if a.get('status') == 'Denied'])
-    withdrawn = len([a for a in applications if a.get('status') == 'Withdrawn'])
+    # Count every status in one pass
+    status_counts = Counter(a.get('status') for a in applications)
 
     return jsonify({
-        'total': total,
-        'submitted': submitted,
-        'tentatively_approved': tentatively_approved,
-        'plan_submitted': plan_submitted,
-        'approved': approved,
-        'completed': completed,
-        'denied': denied,
-        'withdrawn': withdrawn,
+        'total': len(applications),
+        'submitted': status_counts['Submitted'],
+        'tentatively_approved': status_counts['Tentatively Approved'],
+        'plan_submitted': status_counts['Plan Submitted'],
+        'approved': status_counts['Approved'],
+        'completed': status_counts['Completed'],
+        'denied': status_counts['Denied'],
+        'withdrawn': status_counts['Withdrawn'],
         'access': access
     })
 
@@ -3160,7 +3745,10 @@ def get_stats():
 @app.route('/api/statuses', methods=['GET'])
 def get_statuses():
     """Get list of valid status values."""
-    return jsonify({'statuses': STATUS_VALUES})
+    response = jsonify({'statuses': STATUS_VALUES})
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_LIST_MAX_AGE
+    return response
 
 
 # ============ Health Check ============
@@ -3171,6 +3759,28 @@ def health():
     return jsonify({'status': 'healthy'})
 
 
+# ============ Startup Warm-up ============
+
+def warm_up():
+    """
+    Fetch the Google OAuth metadata and load the staff roster (which also sets up
+    BigQuery auth) at startup, so the first request after a cold start doesn't pay for them.
+    """
+    if google:
+        try:
+            google.load_server_metadata()
+        except Exception as e:
+            logger.warning(f"Warm-up: could not load OAuth metadata: {e}")
+    try:
+        get_staff_roster()
+    except Exception as e:
+        logger.warning(f"Warm-up: could not load staff roster: {e}")
+
+
+if os.environ.get('WARM_UP_ON_START', 'true').lower() == 'true':
+    warm_up()
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
@@ -40,6 +40,12 @@ def run_migration():
         # Supervisor info for director routing
         "ALTER TABLE `{project}.{dataset}.applications` ADD COLUMN IF NOT EXISTS supervisor_name STRING",
         "ALTER TABLE `{project}.{dataset}.applications` ADD COLUMN IF NOT EXISTS supervisor_email STRING",
+
+        # New approver emails are stored lowercased; normalize older rows to match
+        "UPDATE `{project}.{dataset}.plan_approvals` SET approver_email = LOWER(approver_email) WHERE approver_email != LOWER(approver_email)",
+
+        # Same for applicant emails (lookups still match case-insensitively)
+        "UPDATE `{project}.{dataset}.applications` SET employee_email = LOWER(TRIM(employee_email)) WHERE employee_email != LOWER(TRIM(employee_email))",
     ]
 
     for sql in migrations:
@@ -54,6 +60,26 @@ def run_migration():
             else:
                 print(f"  Error: {e}")
 
+    # Cluster tables on the columns the app filters by
+    clustering = {
+        'applications': ['employee_email', 'status'],
+        'plan_approvals': ['application_id', 'approver_email'],
+        'checklist_items': ['application_id'],
+        'coverage_assignments': ['application_id'],
+        'plan_links': ['application_id'],
+        'messages': ['application_id'],
+        'activity_history': ['application_id'],
+    }
+    for table_name, fields in clustering.items():
+        print(f"Clustering {table_name} by {', '.join(fields)}...")
+        try:
+            table = client.get_table(f"{PROJECT_ID}.{DATASET_ID}.{table_name}")
+            table.clustering_fields = fields
+            client.update_table(table, ['clustering_fields'])
+            print("  OK")
+        except Exception as e:
+            print(f"  Error: {e}")
+
     print("\nMigration complete!")
 
     # Show current schema